@@ -2,18 +2,16 @@
 from __future__ import annotations
 
 import logging
-import asyncio
 import time
-from datetime import datetime, timedelta
-from email.utils import parsedate_to_datetime
+from datetime import timedelta
 from typing import Any
 
 import aiohttp
-from aiohttp import ClientSession
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_API_KEY, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import (
@@ -40,53 +38,10 @@ PLATFORMS: list[Platform] = [
 ]
 
 
-async def _handle_request(session, method: str, url: str, headers: dict) -> dict:
-    """Make request with rate limit handling."""
-    async with session.request(method, url, headers=headers) as resp:
-        # Log rate limit info
-        limit = resp.headers.get("X-RateLimit-Limit", "unknown")
-        remaining = resp.headers.get("X-RateLimit-Remaining", "unknown")
-        reset = resp.headers.get("X-RateLimit-Reset", "unknown")
-
-        _LOGGER.debug(
-            "API %s %s - Rate limits: limit=%s, remaining=%s, reset=%s",
-            method,
-            url.split("/")[-1],
-            limit,
-            remaining,
-            reset,
-        )
-
-        if resp.status == 429:
-            if "X-RateLimit-Reset" in resp.headers:
-                reset_time = parsedate_to_datetime(resp.headers["X-RateLimit-Reset"])
-                wait_time = (reset_time - datetime.utcnow()).total_seconds()
-                _LOGGER.warning(
-                    "Rate limited! Limit=%s, Remaining=%s. Will reset at %s (in %.0f seconds)",
-                    limit,
-                    remaining,
-                    reset,
-                    max(0, wait_time),
-                )
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time + 1)
-            else:
-                _LOGGER.warning(
-                    "Rate limited! Limit=%s, Remaining=%s. No reset time provided.",
-                    limit,
-                    remaining,
-                )
-                await asyncio.sleep(5)
-            return None
-
-        resp.raise_for_status()
-        return await resp.json()
-
-
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Rachio from config entry."""
     api_key = entry.data[CONF_API_KEY]
-    auth = RachioAuth(api_key)
+    auth = RachioAuth(api_key, hass)
 
     try:
         await auth.async_get_user_info()
@@ -105,7 +60,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             if device.get("device_type") == "SMART_HOSE_TIMER":
                 handler = RachioSmartHoseTimerHandler(api_key, device, auth.user_id, hass, entry)
             else:
-                handler = RachioControllerHandler(api_key, device)
+                handler = RachioControllerHandler(api_key, device, hass)
 
             # Load saved polling intervals from config entry options
             idle_key = f"idle_polling_interval_{device_id}"
@@ -160,12 +115,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 update_interval=timedelta(seconds=30),
             )
             coordinator.num_devices = num_devices  # <-- Set total device count here
+            coordinator.delayed_refresh = None  # Pending post-command refresh (switch.py)
             handler.coordinator = coordinator
             hass.data[DOMAIN][entry.entry_id]["devices"][device_id] = {
                 "handler": handler,
                 "coordinator": coordinator,
             }
             await coordinator.async_config_entry_first_refresh()
+            if isinstance(handler, RachioSmartHoseTimerHandler):
+                await handler.async_startup_reconcile()
 
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
         
@@ -238,57 +196,57 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             _LOGGER.debug(f"API payload being sent: {payload}")
             
             try:
-                async with ClientSession() as session:
-                    async with session.put(url, json=payload, headers=handler.headers) as resp:
-                        if resp.status == 200:
-                            result = await resp.json()
-                            _LOGGER.info(f"Successfully updated program {program_id}")
-                            _LOGGER.debug(f"API response: {result}")
-                            
-                            # Force refresh of only this program's details to reflect changes
-                            details = await handler._fetch_program_details(session, program_id, force_refresh=True)
-                            _LOGGER.debug(f"Fetched program details after update: {details}")
-                            
-                            # Update the program in handler.schedules with fresh data from API
-                            if details and "program" in details:
-                                program_details = details["program"]
-                                for program in handler.schedules:
-                                    if program.get("id") == program_id:
-                                        # Merge all details from API response
-                                        program["enabled"] = program_details.get("enabled", True)
-                                        program["name"] = program_details.get("name", program.get("name"))
-                                        program["color"] = program_details.get("color", "#00A7E1")
-                                        program["startOn"] = program_details.get("startOn", {})
-                                        program["dailyInterval"] = program_details.get("dailyInterval", {})
-                                        program["plannedRuns"] = program_details.get("plannedRuns", [])
-                                        program["assignments"] = program_details.get("assignments", [])
-                                        program["rainSkipEnabled"] = program_details.get("rainSkipEnabled", False)
-                                        program["settings"] = program_details.get("settings", {})
-                                        
-                                        # Copy scheduling type fields
-                                        if "daysOfWeek" in program_details:
-                                            program["daysOfWeek"] = program_details["daysOfWeek"]
-                                        if "evenDays" in program_details:
-                                            program["evenDays"] = program_details["evenDays"]
-                                        if "oddDays" in program_details:
-                                            program["oddDays"] = program_details["oddDays"]
-                                        
-                                        # Update valve IDs from assignments
-                                        if program_details.get("assignments"):
-                                            valve_ids = [a.get("entityId") for a in program_details["assignments"] if a.get("entityId")]
-                                            if valve_ids:
-                                                program["valveIds"] = valve_ids
-                                        
-                                        _LOGGER.info(f"Updated local program data for {program_id}")
-                                        break
-                            
-                            # Trigger a lightweight coordinator data update without polling
-                            # This notifies entities to refresh their state from handler.schedules
-                            handler.coordinator.async_set_updated_data(handler.coordinator.data)
-                            _LOGGER.info(f"Program {program_id} updated - triggered entity refresh (no additional API calls)")
-                        else:
-                            error_text = await resp.text()
-                            _LOGGER.error(f"Failed to update program {program_id}: {resp.status} - {error_text}")
+                session = async_get_clientsession(hass)
+                async with session.put(url, json=payload, headers=handler.headers) as resp:
+                    if resp.status == 200:
+                        result = await resp.json()
+                        _LOGGER.info(f"Successfully updated program {program_id}")
+                        _LOGGER.debug(f"API response: {result}")
+                        
+                        # Force refresh of only this program's details to reflect changes
+                        details = await handler._fetch_program_details(program_id, force_refresh=True)
+                        _LOGGER.debug(f"Fetched program details after update: {details}")
+                        
+                        # Update the program in handler.schedules with fresh data from API
+                        if details and "program" in details:
+                            program_details = details["program"]
+                            for program in handler.schedules:
+                                if program.get("id") == program_id:
+                                    # Merge all details from API response
+                                    program["enabled"] = program_details.get("enabled", True)
+                                    program["name"] = program_details.get("name", program.get("name"))
+                                    program["color"] = program_details.get("color", "#00A7E1")
+                                    program["startOn"] = program_details.get("startOn", {})
+                                    program["dailyInterval"] = program_details.get("dailyInterval", {})
+                                    program["plannedRuns"] = program_details.get("plannedRuns", [])
+                                    program["assignments"] = program_details.get("assignments", [])
+                                    program["rainSkipEnabled"] = program_details.get("rainSkipEnabled", False)
+                                    program["settings"] = program_details.get("settings", {})
+                                    
+                                    # Copy scheduling type fields
+                                    if "daysOfWeek" in program_details:
+                                        program["daysOfWeek"] = program_details["daysOfWeek"]
+                                    if "evenDays" in program_details:
+                                        program["evenDays"] = program_details["evenDays"]
+                                    if "oddDays" in program_details:
+                                        program["oddDays"] = program_details["oddDays"]
+                                    
+                                    # Update valve IDs from assignments
+                                    if program_details.get("assignments"):
+                                        valve_ids = [a.get("entityId") for a in program_details["assignments"] if a.get("entityId")]
+                                        if valve_ids:
+                                            program["valveIds"] = valve_ids
+                                    
+                                    _LOGGER.info(f"Updated local program data for {program_id}")
+                                    break
+                        
+                        # Trigger a lightweight coordinator data update without polling
+                        # This notifies entities to refresh their state from handler.schedules
+                        handler.coordinator.async_set_updated_data(handler.coordinator.data)
+                        _LOGGER.info(f"Program {program_id} updated - triggered entity refresh (no additional API calls)")
+                    else:
+                        error_text = await resp.text()
+                        _LOGGER.error(f"Failed to update program {program_id}: {resp.status} - {error_text}")
             except Exception as err:
                 _LOGGER.error(f"Error updating program {program_id}: {err}")
         
@@ -789,20 +747,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             _LOGGER.debug(f"API payload being sent to createProgramV2: {payload}")
             
             try:
-                async with ClientSession() as session:
-                    async with session.post(url, json=payload, headers=handler.headers) as resp:
-                        if resp.status == 200:
-                            result = await resp.json()
-                            _LOGGER.info(f"Successfully created program '{create_data.get('name', 'Unknown')}' on device {device_id}")
-                            _LOGGER.debug(f"API response: {result}")
-                            
-                            # Force refresh to get new program
-                            await handler.async_update()
-                            handler.coordinator.async_set_updated_data(handler.coordinator.data)
-                            _LOGGER.info(f"Program created - triggered entity refresh")
-                        else:
-                            error_text = await resp.text()
-                            _LOGGER.error(f"Failed to create program on device {device_id}: {resp.status} - {error_text}")
+                session = async_get_clientsession(hass)
+                async with session.post(url, json=payload, headers=handler.headers) as resp:
+                    if resp.status == 200:
+                        result = await resp.json()
+                        _LOGGER.info(f"Successfully created program '{create_data.get('name', 'Unknown')}' on device {device_id}")
+                        _LOGGER.debug(f"API response: {result}")
+                        
+                        # Force refresh to get new program
+                        await handler.async_update()
+                        handler.coordinator.async_set_updated_data(handler.coordinator.data)
+                        _LOGGER.info(f"Program created - triggered entity refresh")
+                    else:
+                        error_text = await resp.text()
+                        _LOGGER.error(f"Failed to create program on device {device_id}: {resp.status} - {error_text}")
             except Exception as err:
                 _LOGGER.error(f"Error creating program on device {device_id}: {err}")
         
@@ -1066,35 +1024,34 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                         
                         if handler:
                             # Fetch current program details
-                            async with ClientSession() as session:
-                                details = await handler._fetch_program_details(session, program_id, force_refresh=True)
+                            details = await handler._fetch_program_details(program_id, force_refresh=True)
+                            
+                            if details and "program" in details:
+                                existing_runs = details["program"].get("plannedRuns", [])
                                 
-                                if details and "program" in details:
-                                    existing_runs = details["program"].get("plannedRuns", [])
-                                    
-                                    if existing_runs:
-                                        # Update each existing run with new valves and any provided settings
-                                        updated_runs = []
-                                        for run_idx, run in enumerate(existing_runs):
-                                            updated_run = run.copy()
-                                            updated_run["entityRuns"] = global_entity_runs
-                                            
-                                            # Apply any run-specific settings if provided
-                                            if run_idx in run_settings:
-                                                for key, value in run_settings[run_idx].items():
-                                                    updated_run[key] = value
-                                                    _LOGGER.debug(f"Run {run_idx + 1}: Updated {key} = {value}")
-                                            
-                                            updated_runs.append(updated_run)
+                                if existing_runs:
+                                    # Update each existing run with new valves and any provided settings
+                                    updated_runs = []
+                                    for run_idx, run in enumerate(existing_runs):
+                                        updated_run = run.copy()
+                                        updated_run["entityRuns"] = global_entity_runs
                                         
-                                        update_data["plannedRuns"] = {
-                                            "runs": updated_runs
-                                        }
-                                        _LOGGER.info(f"Updated {len(updated_runs)} existing run(s) with {len(global_entity_runs)} new valve(s)")
-                                    else:
-                                        _LOGGER.warning("No existing runs found - cannot update valves without specifying run timing")
+                                        # Apply any run-specific settings if provided
+                                        if run_idx in run_settings:
+                                            for key, value in run_settings[run_idx].items():
+                                                updated_run[key] = value
+                                                _LOGGER.debug(f"Run {run_idx + 1}: Updated {key} = {value}")
+                                        
+                                        updated_runs.append(updated_run)
+                                    
+                                    update_data["plannedRuns"] = {
+                                        "runs": updated_runs
+                                    }
+                                    _LOGGER.info(f"Updated {len(updated_runs)} existing run(s) with {len(global_entity_runs)} new valve(s)")
                                 else:
-                                    _LOGGER.error("Failed to fetch existing program details")
+                                    _LOGGER.warning("No existing runs found - cannot update valves without specifying run timing")
+                            else:
+                                _LOGGER.error("Failed to fetch existing program details")
                         else:
                             _LOGGER.error("Handler not found for program update")
                     else:
@@ -1231,7 +1188,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        for device in entry_data["devices"].values():
+            if device["coordinator"].delayed_refresh is not None:
+                device["coordinator"].delayed_refresh.cancel()
         
         # Unregister services
         hass.services.async_remove(DOMAIN, "enable_program")
@@ -5,7 +5,7 @@ import logging
 from typing import Any
 
 import aiohttp
-from aiohttp import ClientSession
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import (
     API_BASE_URL,
@@ -24,9 +24,10 @@ _LOGGER = logging.getLogger(__name__)
 class RachioAuth:
     """Class to make authenticated requests to Rachio APIs."""
 
-    def __init__(self, api_key: str) -> None:
+    def __init__(self, api_key: str, hass=None) -> None:
         """Initialize Rachio authentication."""
         self.api_key = api_key
+        self.hass = hass
         self.user_id = None
         self.headers = {"Authorization": f"Bearer {api_key}"}
 
@@ -43,16 +44,16 @@ class RachioAuth:
 
     async def async_get_user_info(self) -> dict[str, Any]:
         """Get user info from Rachio API."""
-        async with ClientSession() as session:
-            async with session.get(
-                f"{API_BASE_URL}/{PERSON_INFO_ENDPOINT}",
-                headers=self.headers,
-            ) as resp:
-                self._log_rate_limits(resp)
-                resp.raise_for_status()
-                data = await resp.json()
-                self.user_id = data.get("id")
-                return data
+        session = async_get_clientsession(self.hass)
+        async with session.get(
+            f"{API_BASE_URL}/{PERSON_INFO_ENDPOINT}",
+            headers=self.headers,
+        ) as resp:
+            self._log_rate_limits(resp)
+            resp.raise_for_status()
+            data = await resp.json()
+            self.user_id = data.get("id")
+            return data
 
     async def async_discover_devices(self) -> list[dict[str, Any]]:
         """Discover all Rachio devices."""
@@ -61,28 +62,27 @@ class RachioAuth:
 
         devices = []
         # Discover controllers
-        async with ClientSession() as session:
-            async with session.get(
-                f"{API_BASE_URL}/{PERSON_GET_ENDPOINT.format(id=self.user_id)}",
-                headers=self.headers,
-            ) as resp:
-                resp.raise_for_status()
-                data = await resp.json()
-                for device in data.get("devices", []):
-                    model = device.get("model", "").upper()
-                    if any(x in model for x in ["GENERATION", "8ZULW", "16ZULW"]):
-                        device["device_type"] = DEVICE_TYPE_CONTROLLER
-                        devices.append(device)
+        session = async_get_clientsession(self.hass)
+        async with session.get(
+            f"{API_BASE_URL}/{PERSON_GET_ENDPOINT.format(id=self.user_id)}",
+            headers=self.headers,
+        ) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+            for device in data.get("devices", []):
+                model = device.get("model", "").upper()
+                if any(x in model for x in ["GENERATION", "8ZULW", "16ZULW"]):
+                    device["device_type"] = DEVICE_TYPE_CONTROLLER
+                    devices.append(device)
         # Discover smart hose timers
-        async with ClientSession() as session:
-            async with session.get(
-                f"{CLOUD_BASE_URL}{VALVE_LIST_BASE_STATIONS_ENDPOINT.format(userId=self.user_id)}",
-                headers=self.headers,
-            ) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    for timer in data.get("baseStations", []):
-                        timer["device_type"] = DEVICE_TYPE_SMART_HOSE_TIMER
-                        devices.append(timer)
+        async with session.get(
+            f"{CLOUD_BASE_URL}{VALVE_LIST_BASE_STATIONS_ENDPOINT.format(userId=self.user_id)}",
+            headers=self.headers,
+        ) as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                for timer in data.get("baseStations", []):
+                    timer["device_type"] = DEVICE_TYPE_SMART_HOSE_TIMER
+                    devices.append(timer)
         _LOGGER.info("Discovered %d total devices: %s", len(devices), [d.get('name', d.get('serialNumber')) for d in devices])
         return devices
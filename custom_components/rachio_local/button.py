@@ -119,51 +119,48 @@ class RachioRefreshProgramButton(RachioBaseButtonEntity):
 
     async def async_press(self) -> None:
         """Handle the button press - refresh program details."""
-        from aiohttp import ClientSession
-
         _LOGGER.info(f"Refreshing program details for {self.program_id}")
 
         # Directly fetch fresh program details (single API call)
-        async with ClientSession() as session:
-            details = await self.handler._fetch_program_details(session, self.program_id, force_refresh=True)
-
-            if details and "program" in details:
-                program_details = details["program"]
-
-                # Update the program in schedules with fresh data
-                for program in self.handler.schedules:
-                    if program.get("id") == self.program_id:
-                        # Update all program details
-                        program["enabled"] = program_details.get("enabled", True)
-                        program["color"] = program_details.get("color", "#00A7E1")
-                        program["startOn"] = program_details.get("startOn", {})
-                        program["dailyInterval"] = program_details.get("dailyInterval", {})
-                        program["plannedRuns"] = program_details.get("plannedRuns", [])
-                        program["assignments"] = program_details.get("assignments", [])
-                        program["rainSkipEnabled"] = program_details.get("rainSkipEnabled", False)
-                        program["settings"] = program_details.get("settings", {})
-
-                        # Copy scheduling type fields
-                        if "daysOfWeek" in program_details:
-                            program["daysOfWeek"] = program_details["daysOfWeek"]
-                        if "evenDays" in program_details:
-                            program["evenDays"] = program_details["evenDays"]
-                        if "oddDays" in program_details:
-                            program["oddDays"] = program_details["oddDays"]
-
-                        # Update valve IDs from assignments
-                        if program_details.get("assignments"):
-                            valve_ids = [a.get("entityId") for a in program_details["assignments"] if a.get("entityId")]
-                            if valve_ids:
-                                program["valveIds"] = valve_ids
-
-                        _LOGGER.info(f"Successfully refreshed program '{program.get('name')}' details")
-                        break
-
-                # Trigger a state update for sensors (without doing a full refresh)
-                self.coordinator.async_set_updated_data(self.coordinator.data)
-            else:
-                _LOGGER.warning(f"Failed to refresh program {self.program_id} - program may have been deleted")
+        details = await self.handler._fetch_program_details(self.program_id, force_refresh=True)
+
+        if details and "program" in details:
+            program_details = details["program"]
+
+            # Update the program in schedules with fresh data
+            for program in self.handler.schedules:
+                if program.get("id") == self.program_id:
+                    # Update all program details
+                    program["enabled"] = program_details.get("enabled", True)
+                    program["color"] = program_details.get("color", "#00A7E1")
+                    program["startOn"] = program_details.get("startOn", {})
+                    program["dailyInterval"] = program_details.get("dailyInterval", {})
+                    program["plannedRuns"] = program_details.get("plannedRuns", [])
+                    program["assignments"] = program_details.get("assignments", [])
+                    program["rainSkipEnabled"] = program_details.get("rainSkipEnabled", False)
+                    program["settings"] = program_details.get("settings", {})
+
+                    # Copy scheduling type fields
+                    if "daysOfWeek" in program_details:
+                        program["daysOfWeek"] = program_details["daysOfWeek"]
+                    if "evenDays" in program_details:
+                        program["evenDays"] = program_details["evenDays"]
+                    if "oddDays" in program_details:
+                        program["oddDays"] = program_details["oddDays"]
+
+                    # Update valve IDs from assignments
+                    if program_details.get("assignments"):
+                        valve_ids = [a.get("entityId") for a in program_details["assignments"] if a.get("entityId")]
+                        if valve_ids:
+                            program["valveIds"] = valve_ids
+
+                    _LOGGER.info(f"Successfully refreshed program '{program.get('name')}' details")
+                    break
+
+            # Trigger a state update for sensors (without doing a full refresh)
+            self.coordinator.async_set_updated_data(self.coordinator.data)
+        else:
+            _LOGGER.warning(f"Failed to refresh program {self.program_id} - program may have been deleted")
 
         _LOGGER.debug(f"Program {self.program_id} refresh complete (1 API call)")
 
@@ -24,7 +24,7 @@ _LOGGER = logging.getLogger(__name__)
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect."""
-    auth = RachioAuth(data[CONF_API_KEY])
+    auth = RachioAuth(data[CONF_API_KEY], hass)
     try:
         user_info = await auth.async_get_user_info()
         return {"title": f"Rachio ({user_info.get('username', DEFAULT_NAME)})"}
@@ -5,6 +5,7 @@ VERSION = "1.0.0"
 
 # Configuration
 CONF_API_KEY = "api_key"
+CONF_SUMMARY_END_DAYS = "summary_end_days"  # Per-device option key prefix
 DEFAULT_NAME = "Rachio"
 
 # State Constants
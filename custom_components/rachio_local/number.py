@@ -11,7 +11,7 @@ from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import CONF_SUMMARY_END_DAYS, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,7 +20,6 @@ _LOGGER = logging.getLogger(__name__)
 CONF_IDLE_POLLING_INTERVAL = "idle_polling_interval"
 CONF_ACTIVE_POLLING_INTERVAL = "active_polling_interval"
 CONF_PROGRAM_DETAILS_REFRESH_INTERVAL = "program_details_refresh_interval"
-CONF_SUMMARY_END_DAYS = "summary_end_days"
 
 
 async def async_setup_entry(
@@ -210,8 +209,7 @@ class RachioProgramDetailsRefreshIntervalNumber(CoordinatorEntity, NumberEntity)
         # Invalidate all program cache timestamps to force refresh on next coordinator update
         # This ensures the new interval takes effect immediately
         if hasattr(self.handler, '_program_details'):
-            for program_id in self.handler._program_details:
-                self.handler._program_details[program_id]["last_fetched"] = 0
+            self.handler._cache_epoch += 1
             _LOGGER.debug(
                 "%s: Invalidated %d program cache entries to apply new refresh interval",
                 self.handler.name,
@@ -29,6 +29,7 @@ from .const import (
     DEVICE_TYPE_SMART_HOSE_TIMER,
     # Add battery status constants if needed
 )
+from .utils import parse_iso_timestamp
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -272,7 +273,7 @@ class RachioValveLastWateredSensor(RachioZoneLastWateredSensor, RestoreEntity):
                 if last_action.get("start") and last_action.get("durationSeconds"):
                     try:
                         start_str = last_action["start"]
-                        start_time = datetime.fromisoformat(start_str.replace("Z", "+00:00"))
+                        start_time = parse_iso_timestamp(start_str)
                         duration_seconds = int(last_action["durationSeconds"])
                         end_time = start_time + timedelta(seconds=duration_seconds)
 
@@ -513,7 +514,7 @@ class RachioAPICallSensor(RachioBaseEntity, SensorEntity):
                         from email.utils import parsedate_to_datetime
                         reset_dt = parsedate_to_datetime(reset_utc)
                     except Exception:
-                        reset_dt = datetime.fromisoformat(reset_utc)
+                        reset_dt = parse_iso_timestamp(reset_utc)
                 reset_local = reset_dt.astimezone().strftime("%Y-%m-%d %H:%M:%S %Z")
             except Exception:
                 reset_local = reset_utc
@@ -884,11 +885,7 @@ class RachioSmartHoseTimerProgramSensor(RachioBaseEntity, SensorEntity):
                 if isinstance(start_val, datetime):
                     next_run_time = start_val
                 elif isinstance(start_val, str):
-                    # Handle both Z and +00:00 endings
-                    if start_val.endswith("Z"):
-                        next_run_time = datetime.fromisoformat(start_val.replace("Z", "+00:00"))
-                    else:
-                        next_run_time = datetime.fromisoformat(start_val)
+                    next_run_time = parse_iso_timestamp(start_val)
                 else:
                     raise ValueError(f"Unexpected type for next_run['start']: {type(start_val)}")
                 now = datetime.now(timezone.utc)
@@ -1,13 +1,19 @@
 """Handler for Rachio Smart Hose Timer devices."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import random
 import time
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
-from aiohttp import ClientSession
+from itertools import chain
+import orjson
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from .const import (
     CLOUD_BASE_URL,
+    CONF_SUMMARY_END_DAYS,
     VALVE_GET_BASE_STATION_ENDPOINT,
     VALVE_LIST_VALVES_ENDPOINT,
     SUMMARY_VALVE_VIEWS,
@@ -17,11 +23,209 @@ from .const import (
     PROGRAM_GET_V2,
     DOMAIN,
 )
-from .utils import get_update_interval
+from .utils import (
+    get_update_interval,
+    parse_iso_timestamp,
+    update_in_place,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Program details cache: stable programs back off from the configured refresh
+# interval up to a day, programs that are running or about to run use a short TTL
+PROGRAM_DETAILS_MAX_TTL = 86400
+PROGRAM_DETAILS_ACTIVE_TTL = 300
+PROGRAM_DETAILS_UPCOMING_WINDOW = 3600
+# Program detail fetches run in parallel, but never more than this many at once
+PROGRAM_DETAILS_MAX_CONCURRENT_FETCHES = 8
+# Spread of the random factor applied to each program's cache TTL, so programs
+# fetched together don't all expire on the same update
+PROGRAM_DETAILS_TTL_JITTER = 0.1
+# Returned by _make_request when a conditional request comes back 304
+NOT_MODIFIED = object()
+# Grace period after a watering action's end before it's treated as completed
+API_LAG_BUFFER = timedelta(seconds=30)
+
+
+def _parse_timestamp(value: str, cache: dict) -> datetime:
+    """Parse an ISO 8601 API timestamp, reusing an earlier result from cache."""
+    parsed = cache.get(value)
+    if parsed is None:
+        parsed = cache[value] = parse_iso_timestamp(value)
+    return parsed
+
+
+# Program fields copied from getProgramV2 details onto schedule entries, with
+# the default used when the API omits them. Defaults are shared, never mutated.
+_PROGRAM_DETAIL_FIELDS = (
+    ("enabled", True),
+    ("color", "#00A7E1"),
+    ("startOn", {}),
+    ("dailyInterval", {}),
+    ("plannedRuns", []),
+    ("assignments", []),
+    ("rainSkipEnabled", False),
+    ("settings", {}),
+)
+# Scheduling type fields, only present for the matching schedule type
+_PROGRAM_SCHEDULE_TYPE_FIELDS = ("daysOfWeek", "evenDays", "oddDays")
+# Legacy fields for backward compatibility (may not exist for Smart Hose Timers)
+_PROGRAM_LEGACY_FIELDS = ("schedule", "durationSeconds", "createdAt", "updatedAt")
+
+
+def _program_detail_fields(program_details: dict) -> dict:
+    """Return the schedule entry fields derived from getProgramV2 program details."""
+    details_get = program_details.get
+    fields = {key: details_get(key, default) for key, default in _PROGRAM_DETAIL_FIELDS}
+
+    for key in _PROGRAM_SCHEDULE_TYPE_FIELDS:
+        if key in program_details:
+            fields[key] = program_details[key]
+
+    # Update valveIds from assignments to get complete list
+    # (summary API may only show valves from a specific run)
+    assignments = details_get("assignments")
+    if assignments:
+        valve_ids = [a.get("entityId") for a in assignments if a.get("entityId")]
+        if valve_ids:
+            fields["valveIds"] = valve_ids
+    return fields
+
+
+def _merge_program_details(program: dict, program_details: dict) -> None:
+    """Merge getProgramV2 program details into a schedule entry in place."""
+    program.update(_program_detail_fields(program_details))
+
+
+def _build_planned_start_index(schedules: list[dict]) -> dict[str, list[tuple[dict, list[float]]]]:
+    """Map each valve id to the programs using it and their plannedRuns start timestamps."""
+    index = defaultdict(list)
+    for program in schedules:
+        planned_starts = []
+        for planned_run in program.get("plannedRuns", []):
+            # plannedRuns contains start time info
+            start_info = planned_run.get("start", {})
+            if start_info:
+                try:
+                    # Parse the planned start time
+                    year = start_info.get("year")
+                    month = start_info.get("month")
+                    day = start_info.get("day")
+                    hour = start_info.get("hour", 0)
+                    minute = start_info.get("minute", 0)
+
+                    if year and month and day:
+                        planned_starts.append(datetime(year, month, day, hour, minute, tzinfo=timezone.utc).timestamp())
+                except Exception as e:
+                    _LOGGER.debug("Error parsing planned run time for program %s: %s", program.get("id"), e)
+        for valve_id in program.get("valveIds", []):
+            index[valve_id].append((program, planned_starts))
+    return index
+
+
+def _build_valve_run_info(valve_run: dict, current_time: datetime, parsed_starts: dict, source: str, **extras) -> dict | None:
+    """Build the history entry for one valve run, or None if it has no start time.
+
+    Raises ValueError if the start time can't be parsed.
+    """
+    vr_get = valve_run.get
+    start_str = vr_get("start")
+    if not start_str:
+        return None
+    start_time = _parse_timestamp(start_str, parsed_starts)
+    return {
+        "start": start_time,
+        "start_str": start_str,
+        "duration_seconds": vr_get("durationSeconds", 0),
+        "flow_detected": vr_get("flowDetected"),
+        "source": source,
+        **extras,
+        "is_future": start_time > current_time,
+    }
+
+
+def _find_previous_and_next_run(runs: list[dict]) -> tuple[dict | None, dict | None]:
+    """Return the most recent past run and the earliest future run in one pass.
+
+    Ties on start time resolve to the later entry in the list, matching the
+    previous sort-then-scan behaviour.
+    """
+    previous_run = None
+    next_run = None
+    for run in runs:
+        start = run["start"]
+        if run["is_future"]:
+            if next_run is None or start <= next_run["start"]:
+                next_run = run
+        elif previous_run is None or start >= previous_run["start"]:
+            previous_run = run
+    return previous_run, next_run
+
+
+# A planned start this close to the valve's start can't be beaten meaningfully,
+# so the plannedRuns fallback stops scanning once it finds one
+PLANNED_RUN_EXACT_MATCH = 60
+
+# Run summary slots checked when matching a running valve to a program, with the
+# max start time difference accepted for each. The previous run window is wider
+# to handle API lag for manual program runs.
+_SUMMARY_MATCH_WINDOWS = (("previous_run", 3600), ("next_run", 1800))
+
+
+def _match_by_run_summaries(summaries: dict | None, valve_id: str, valve_start_ts: float) -> str | None:
+    """Match a running valve to a program using its previous/next run summaries."""
+    if not summaries:
+        return None
+    for slot, max_diff in _SUMMARY_MATCH_WINDOWS:
+        run = summaries.get(slot)
+        if not run or run.get("source") != "program":
+            continue
+        run_start = run.get("start")
+        program_id = run.get("program_id")
+        if not run_start or not program_id:
+            continue
+        time_diff = abs(run_start.timestamp() - valve_start_ts)
+        if time_diff < max_diff:
+            _LOGGER.info("Valve %s matched to program %s via %s timing (diff: %.0fs)", valve_id, program_id, slot, time_diff)
+            return program_id
+    return None
+
+
+def _match_by_planned_runs(planned_start_index: dict, valve_id: str, valve_start_ts: float) -> str | None:
+    """Match a running valve to the program whose plannedRuns start closest to it (within 1 hour)."""
+    best_match = None
+    best_time_diff = float('inf')
+    debug_enabled = _LOGGER.isEnabledFor(logging.DEBUG)
+
+    # Only programs that use this valve, with their plannedRuns already parsed
+    for program, planned_starts in planned_start_index.get(valve_id, ()):
+        program_id = program.get("id")
+        for planned_start in planned_starts:
+            time_diff = abs(planned_start - valve_start_ts)
+
+            if debug_enabled:
+                _LOGGER.debug("  Program %s (%s): planned_start=%s, diff=%.0fs", program_id, program.get("name"), datetime.fromtimestamp(planned_start, timezone.utc), time_diff)
+
+            if time_diff < best_time_diff:
+                best_time_diff = time_diff
+                best_match = program_id
+                if time_diff < PLANNED_RUN_EXACT_MATCH:
+                    break
+        if best_time_diff < PLANNED_RUN_EXACT_MATCH:
+            break
+
+    if best_match and best_time_diff < 3600:  # Within 1 hour
+        _LOGGER.info("Valve %s matched to program %s via plannedRuns timing (diff: %.0fs)", valve_id, best_match, best_time_diff)
+        return best_match
+    if best_match:
+        _LOGGER.debug("Best program match for valve %s is %s but time diff (%.0fs) exceeds 1 hour - likely a manual run", valve_id, best_match, best_time_diff)
+    return None
+
+
 class RachioSmartHoseTimerHandler:
+    OPTIMISTIC_WINDOW = 60  # seconds a started valve/program is shown on before the API confirms it
+    API_CALLS_PER_POLL = 3  # base station, valve list and summary requests made by one async_update
+
     def __init__(self, api_key: str, device_data: dict, user_id: str = None, hass = None, config_entry = None) -> None:
         self.api_key = api_key
         self.device_data = device_data
@@ -33,16 +237,19 @@ class RachioSmartHoseTimerHandler:
         self.name = device_data.get("name") or device_data.get("serialNumber") or "Smart Hose Timer"
         self.model = device_data.get("model", "")
         self.zones = []
+        self._zones_by_id = {}  # zone_id -> zone, rebuilt whenever zones are fetched
         self.schedules = []
-        self.running_zones = {}
-        self.running_schedules = {}
+        # Always dicts keyed by id (updated in place); entities and get_update_interval rely on it
+        self.running_zones = {}  # zone_id -> running info
+        self.running_schedules = {}  # schedule/program id -> running info
         self.status = device_data.get("status", "OFFLINE")
         self.headers = {"Authorization": f"Bearer {api_key}"}
         self.coordinator = None
-        self._pending_start = {}
+        self._pending_start = {}  # id -> time.monotonic() deadline of the optimistic window
         self._last_watering_completed = {}  # Track completed watering times
         self._force_stopped = {}  # Track valves we've force stopped (zone_id -> timestamp)
         self._expected_end_times = {}  # Track expected end times for running valves (zone_id -> end_time)
+        self._parsed_actions = {}  # zone_id -> ((start, durationSeconds), start_time, end_time, end_time_buffer)
         self.api_call_count = 0
         self.api_rate_limit = None
         self.api_rate_remaining = None
@@ -58,7 +265,10 @@ class RachioSmartHoseTimerHandler:
         self.valve_day_views = []  # Raw valve day views data for calendar
 
         # Program details cache with timestamps (for enabled/disabled status and other details)
-        self._program_details = {}  # program_id -> {details: {...}, last_fetched: timestamp}
+        self._program_details = {}  # program_id -> {details: {...}, fields: {...}, last_fetched: timestamp, epoch: int, hash: int, unchanged_fetches: int, jitter: float}
+        self._response_validators = {}  # url -> (ETag, Last-Modified) from the last cacheable GET
+        self._cache_epoch = 0  # Bumped to invalidate every cached program at once
+        self._program_details_semaphore = asyncio.Semaphore(PROGRAM_DETAILS_MAX_CONCURRENT_FETCHES)
         self._program_details_refresh_interval = 3600  # Refresh hourly (in seconds)
         self._first_update_complete = False  # Track if we've done the initial update
         self._deleted_programs = set()  # Track programs that have been deleted from Rachio (to avoid repeated API calls)
@@ -71,29 +281,64 @@ class RachioSmartHoseTimerHandler:
         self.base_station_mac = None
         self.base_station_rssi = None
 
-    async def _make_request(self, session, url: str, method: str = "GET", json_data: dict = None) -> dict | None:
+    def _push_state(self) -> None:
+        """Push locally known state to entities without polling the API.
+
+        Command responses already tell us the new state; the entity that issued
+        the command schedules the confirming poll, so an immediate refresh here
+        would only spend rate limit on data the API hasn't caught up with yet.
+        """
+        if self.coordinator:
+            self.coordinator.async_update_listeners()
+
+    def _get_session(self):
+        """Return Home Assistant's shared session used for every request from this handler."""
+        return async_get_clientsession(self.hass)
+
+    async def _make_request(self, url: str, method: str = "GET", json_data: dict = None, conditional: bool = False, cacheable: bool = False) -> dict | None:
+        """Send a request and return the parsed JSON body, or None on failure.
+
+        With conditional=True a GET revalidates against the ETag/Last-Modified of
+        the previous response for the same URL and returns NOT_MODIFIED on a 304.
+        With cacheable=True a successful GET records its ETag/Last-Modified, so the
+        first conditional request for that URL can already revalidate.
+        """
+        session = self._get_session()
         try:
             if method == "POST":
                 async with session.post(url, headers=self.headers, json=json_data) as resp:
                     return await self._process_response(resp, url)
             else:
-                async with session.get(url, headers=self.headers) as resp:
-                    return await self._process_response(resp, url)
+                headers = self.headers
+                if conditional:
+                    etag, last_modified = self._response_validators.get(url, (None, None))
+                    if etag or last_modified:
+                        headers = dict(headers)
+                        if etag:
+                            headers["If-None-Match"] = etag
+                        if last_modified:
+                            headers["If-Modified-Since"] = last_modified
+                async with session.get(url, headers=headers) as resp:
+                    return await self._process_response(resp, url, conditional, cacheable)
         except Exception as err:
             _LOGGER.error("Error in _make_request: %s", err)
             return None
 
-    async def _process_response(self, resp, url: str) -> dict | None:
+    async def _process_response(self, resp, url: str, conditional: bool = False, cacheable: bool = False) -> dict | None:
         """Process API response and extract rate limit headers."""
         self.api_call_count += 1
 
         # Only update rate limit values if they're present (don't overwrite with None)
-        if "X-RateLimit-Limit" in resp.headers:
-            self.api_rate_limit = resp.headers.get("X-RateLimit-Limit")
-        if "X-RateLimit-Remaining" in resp.headers:
-            self.api_rate_remaining = resp.headers.get("X-RateLimit-Remaining")
-        if "X-RateLimit-Reset" in resp.headers:
-            self.api_rate_reset = resp.headers.get("X-RateLimit-Reset")
+        headers = resp.headers
+        limit = headers.get("X-RateLimit-Limit")
+        if limit is not None:
+            self.api_rate_limit = limit
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is not None:
+            self.api_rate_remaining = remaining
+        reset = headers.get("X-RateLimit-Reset")
+        if reset is not None:
+            self.api_rate_reset = reset
 
         # Commented out to reduce log noise (called on every API request)
         # _LOGGER.debug(f"[_make_request] Rate limit headers: Limit={self.api_rate_limit}, Remaining={self.api_rate_remaining}, Reset={self.api_rate_reset}")
@@ -101,14 +346,92 @@ class RachioSmartHoseTimerHandler:
         if resp.status == 404:
             _LOGGER.debug("%s: No data found at %s", self.name, url)
             return None
+        if conditional and resp.status == 304:
+            return NOT_MODIFIED
         resp.raise_for_status()
-        return await resp.json()
-
-    async def _fetch_program_details(self, session, program_id: str, force_refresh: bool = False) -> dict | None:
+        if cacheable:
+            etag = headers.get("ETag")
+            last_modified = headers.get("Last-Modified")
+            if etag or last_modified:
+                self._response_validators[url] = (etag, last_modified)
+        # Decode the raw body directly; skips aiohttp's charset detection and text decode.
+        # An empty body (e.g. 204) returns None, as resp.json() did
+        body = await resp.read()
+        return orjson.loads(body) if body else None
+
+    def _cache_program_details(self, program_id: str, details: dict, fetched_at: float) -> None:
+        """Store fetched program details, tracking whether they changed since the last fetch."""
+        details_hash = hash(orjson.dumps(details, option=orjson.OPT_SORT_KEYS))
+        unchanged_fetches = 0
+        cached = self._program_details.get(program_id)
+        # A forced refresh (epoch bump) restarts the backoff at the configured interval
+        if cached is not None and cached["epoch"] == self._cache_epoch and cached.get("hash") == details_hash:
+            unchanged_fetches = cached.get("unchanged_fetches", 0) + 1
+        # Precompute the fields merged into the schedule entry on every update
+        # while this entry stays fresh
+        fields = None
+        if "program" in details:
+            program_details = details["program"]
+            fields = _program_detail_fields(program_details)
+            for key in _PROGRAM_LEGACY_FIELDS:
+                value = program_details.get(key)
+                if value:
+                    fields[key] = value
+        self._program_details[program_id] = {
+            "details": details,
+            "fields": fields,
+            "last_fetched": fetched_at,
+            "epoch": self._cache_epoch,
+            "hash": details_hash,
+            "unchanged_fetches": unchanged_fetches,
+            "jitter": random.uniform(1 - PROGRAM_DETAILS_TTL_JITTER, 1 + PROGRAM_DETAILS_TTL_JITTER),
+        }
+
+    def _revalidate_program_details(self, cached: dict, fetched_at: float) -> None:
+        """Mark a cache entry fresh again after the API reported it unchanged."""
+        cached["last_fetched"] = fetched_at
+        if cached["epoch"] == self._cache_epoch:
+            cached["unchanged_fetches"] = cached.get("unchanged_fetches", 0) + 1
+        else:
+            # A forced refresh (epoch bump) restarts the backoff at the configured interval
+            cached["epoch"] = self._cache_epoch
+            cached["unchanged_fetches"] = 0
+
+    def _program_details_ttl(self, program_id: str, current_time: float) -> float:
+        """Return how long cached details for a program stay fresh, in seconds.
+
+        Each fetch that returns unchanged details doubles the configured refresh
+        interval (capped at a day), scaled by the entry's jitter factor. Programs
+        that are running or start within the hour drop to a short TTL so edits
+        are picked up before they take effect.
+        """
+        cached = self._program_details[program_id]
+        ttl = min(
+            self._program_details_refresh_interval * 2 ** cached.get("unchanged_fetches", 0) * cached.get("jitter", 1),
+            PROGRAM_DETAILS_MAX_TTL,
+        )
+        if ttl <= PROGRAM_DETAILS_ACTIVE_TTL:
+            return ttl
+        if program_id in self.running_schedules:
+            return PROGRAM_DETAILS_ACTIVE_TTL
+        next_run = self.program_run_summaries.get(program_id, {}).get("next_run")
+        if next_run:
+            until_next_run = next_run["start"].timestamp() - current_time
+            if until_next_run < PROGRAM_DETAILS_UPCOMING_WINDOW:
+                return PROGRAM_DETAILS_ACTIVE_TTL
+        return ttl
+
+    def _is_program_details_fresh(self, program_id: str, current_time: float) -> bool:
+        """Check whether cached details for a program can be used without refetching."""
+        cached = self._program_details.get(program_id)
+        if cached is None or cached["epoch"] != self._cache_epoch:
+            return False
+        return current_time - cached["last_fetched"] < self._program_details_ttl(program_id, current_time)
+
+    async def _fetch_program_details(self, program_id: str, force_refresh: bool = False) -> dict | None:
         """Fetch detailed program information using getProgramV2 API with smart caching.
 
         Args:
-            session: aiohttp ClientSession
             program_id: The program ID to fetch
             force_refresh: If True, bypass cache and fetch fresh data
 
@@ -118,26 +441,26 @@ class RachioSmartHoseTimerHandler:
         current_time = time.time()
 
         # Check if we have cached data and it's still fresh (unless force_refresh is True)
-        if not force_refresh and program_id in self._program_details:
-            cached = self._program_details[program_id]
-            age = current_time - cached["last_fetched"]
-            if age < self._program_details_refresh_interval:
-                # Commented out to reduce log noise (called frequently during updates)
-                # _LOGGER.debug(f"Using cached program details for {program_id} (age: {age:.0f}s)")
-                return cached["details"]
+        if not force_refresh and self._is_program_details_fresh(program_id, current_time):
+            # Commented out to reduce log noise (called frequently during updates)
+            # _LOGGER.debug(f"Using cached program details for {program_id}")
+            return self._program_details[program_id]["details"]
 
         # Fetch fresh data
         url = f"{CLOUD_BASE_URL}/{PROGRAM_GET_V2.format(id=program_id)}"
         # Commented out to reduce log noise
         # _LOGGER.debug(f"Fetching fresh program details for {program_id}")
-        data = await self._make_request(session, url)
+        # Revalidate instead of refetching when we already hold a copy
+        cached = self._program_details.get(program_id)
+        async with self._program_details_semaphore:
+            data = await self._make_request(url, conditional=cached is not None, cacheable=True)
+
+        if data is NOT_MODIFIED:
+            self._revalidate_program_details(cached, current_time)
+            return cached["details"]
 
         if data:
-            # Cache the result with timestamp
-            self._program_details[program_id] = {
-                "details": data,
-                "last_fetched": current_time
-            }
+            self._cache_program_details(program_id, data, current_time)
             # Commented out to reduce log noise
             # _LOGGER.debug(f"Cached program details for {program_id}")
             return data
@@ -158,28 +481,31 @@ class RachioSmartHoseTimerHandler:
 
         try:
             registry = er.async_get(self.hass)
+            async_get_entity_id = registry.async_get_entity_id
+            async_remove = registry.async_remove
+            sensor_prefix = self.device_id + "_program_"
+            button_prefix = self.device_id + "_refresh_program_"
+            debug_enabled = _LOGGER.isEnabledFor(logging.DEBUG)
 
             for program_id in program_ids:
                 # Find and remove sensor entity using unique_id (more reliable than entity_id)
-                sensor_unique_id = f"{self.device_id}_program_{program_id}"
-                sensor_entry = registry.async_get_entity_id("sensor", DOMAIN, sensor_unique_id)
+                sensor_entry = async_get_entity_id("sensor", DOMAIN, sensor_prefix + program_id)
                 if sensor_entry:
-                    registry.async_remove(sensor_entry)
-                    _LOGGER.info(f"Removed sensor entity for deleted program {program_id}")
-                else:
-                    _LOGGER.debug(f"Sensor entity for program {program_id} not found in registry (may have been manually removed)")
+                    async_remove(sensor_entry)
+                    _LOGGER.info("Removed sensor entity for deleted program %s", program_id)
+                elif debug_enabled:
+                    _LOGGER.debug("Sensor entity for program %s not found in registry (may have been manually removed)", program_id)
 
                 # Find and remove button entity
-                button_unique_id = f"{self.device_id}_refresh_program_{program_id}"
-                button_entry = registry.async_get_entity_id("button", DOMAIN, button_unique_id)
+                button_entry = async_get_entity_id("button", DOMAIN, button_prefix + program_id)
                 if button_entry:
-                    registry.async_remove(button_entry)
-                    _LOGGER.info(f"Removed button entity for deleted program {program_id}")
-                else:
-                    _LOGGER.debug(f"Button entity for program {program_id} not found in registry (may have been manually removed)")
+                    async_remove(button_entry)
+                    _LOGGER.info("Removed button entity for deleted program %s", program_id)
+                elif debug_enabled:
+                    _LOGGER.debug("Button entity for program %s not found in registry (may have been manually removed)", program_id)
 
         except Exception as e:
-            _LOGGER.warning(f"Error removing entities for deleted programs: {e}")
+            _LOGGER.warning("Error removing entities for deleted programs: %s", e)
 
     def force_program_details_refresh(self) -> None:
         """Mark all program details cache as stale to force refresh on next update.
@@ -187,981 +513,828 @@ class RachioSmartHoseTimerHandler:
         This method doesn't actually fetch data - it just marks the cache as stale.
         Call this before triggering a coordinator refresh to ensure fresh program details.
         """
-        _LOGGER.info(f"Marking all program details cache as stale for {self.name}")
+        _LOGGER.info("Marking all program details cache as stale for %s", self.name)
 
-        # Clear all program detail caches to force fresh fetch on next update
-        for program_id in list(self._program_details.keys()):
-            self._program_details[program_id]["last_fetched"] = 0  # Force stale
+        # Moving to a new epoch makes every existing cache entry stale
+        self._cache_epoch += 1
 
-        _LOGGER.debug(f"Marked {len(self._program_details)} program caches as stale")
+        _LOGGER.debug("Marked %s program caches as stale", len(self._program_details))
 
-    async def async_update(self) -> None:
+    async def async_startup_reconcile(self) -> None:
+        """Reconcile program entities left over from a previous session.
+
+        Runs once after the first coordinator refresh. Program sensors whose
+        program isn't in the summary (usually disabled programs) get their details
+        fetched and are added to schedules, and entities for programs that no
+        longer exist are removed from the registry.
+        """
+        if not self.hass:
+            return
+        programs_to_remove_at_startup = []
         try:
-            # Commented out to reduce log noise (called on every update)
-            # _LOGGER.debug("Updating smart hose timer: %s", self.device_id)
-            async with ClientSession() as session:
-                # Get base station info
-                url = f"{CLOUD_BASE_URL}{VALVE_GET_BASE_STATION_ENDPOINT.format(id=self.device_id)}"
-                data = await self._make_request(session, url)
-                if data:
-                    self.device_data = data
-                    # Handle both single baseStation and array baseStations format
-                    base_stations = data.get("baseStations", [])
-                    if base_stations:
-                        base_station = base_stations[0]
-                    else:
-                        base_station = data.get("baseStation", {})
-
-                    state = base_station.get("reportedState", {})
-
-                    # Update base station attributes
-                    self.base_station_connected = state.get("connected", False)
-                    # Prefer bleHubFirmwareVersion, fall back to firmwareVersion
-                    self.base_station_firmware = state.get("bleHubFirmwareVersion") or state.get("firmwareVersion")
-                    self.base_station_wifi_firmware = state.get("wifiBridgeFirmwareVersion")
-                    self.base_station_mac = base_station.get("macAddress")
-                    self.base_station_rssi = state.get("rssi")
-                    self.status = "ONLINE" if state.get("connected") else "OFFLINE"
-                else:
-                    self.device_data = {}
-                    self.status = "OFFLINE"
-                    self.base_station_connected = False
-
-                # Get valves (zones)
-                url = f"{CLOUD_BASE_URL}{VALVE_LIST_VALVES_ENDPOINT.format(baseStationId=self.device_id)}"
-                data = await self._make_request(session, url)
-                if data:
-                    self.zones = data.get("valves", [])
-                else:
-                    self.zones = []
-
-                # Get programs (schedules) using getValveDayViews summary API
-                # This API returns program information including multi-valve programs
-                # Query the next 7 days to get scheduled program information
-                url = f"{CLOUD_BASE_URL}/{SUMMARY_VALVE_VIEWS}"
-                today = datetime.now()
-
-                # Query 1 day in the past and N days in the future (user-configurable)
-                start_date = today - timedelta(days=1)
-                # Try to get summary_end_days from config entry options (per device)
-                summary_end_days = 7
-                config_options_debug = None
-                if self.config_entry is not None:
-                    from .number import CONF_SUMMARY_END_DAYS
-                    config_key = f"{CONF_SUMMARY_END_DAYS}_{self.device_id}"
-                    config_options_debug = dict(self.config_entry.options)
-                    summary_end_days = self.config_entry.options.get(config_key, 7)
-                #_LOGGER.debug(f"[DEBUG] Config entry options for {self.device_id}: {config_options_debug}, using summary_end_days={summary_end_days}")
-                end_date = today + timedelta(days=summary_end_days)
-
-                payload = {
-                    "start": {
-                        "year": start_date.year,
-                        "month": start_date.month,
-                        "day": start_date.day
-                    },
-                    "end": {
-                        "year": end_date.year,
-                        "month": end_date.month,
-                        "day": end_date.day
-                    },
-                    "resourceId": {
-                        "baseStationId": self.device_id
+            registry = er.async_get(self.hass)
+            prefix = f"{self.device_id}_program_"
+            schedule_ids = {p.get("id") for p in self.schedules}
+            # Only our own config entry's entities can be program sensors, and the
+            # registry indexes those, so avoid walking every entity in Home Assistant
+            if self.config_entry is not None:
+                entries = er.async_entries_for_config_entry(registry, self.config_entry.entry_id)
+            else:
+                entries = list(registry.entities.values())
+            # Find all program sensor entities for this device
+            programs_to_fetch = []
+            for entry in entries:
+                if entry.domain == "sensor" and entry.platform == DOMAIN:
+                    # Check if this is a program sensor for our device
+                    if entry.unique_id and entry.unique_id.startswith(prefix):
+                        # Extract program_id from unique_id
+                        program_id = entry.unique_id[len(prefix):]
+
+                        # If program is already marked as deleted, schedule it for removal
+                        if program_id in self._deleted_programs:
+                            programs_to_remove_at_startup.append(program_id)
+                            _LOGGER.info("Found entity for already-deleted program %s - will remove", program_id)
+                            continue
+
+                        if program_id not in schedule_ids:
+                            # This program has an entity but isn't in schedules
+                            # It's likely disabled - fetch its details
+                            _LOGGER.info("Found existing entity for program %s not in schedules - will fetch details (likely disabled)", program_id)
+                            programs_to_fetch.append(program_id)
+
+            # Fetch the program details concurrently (also caches them)
+            results = await asyncio.gather(*(
+                self._fetch_program_details(program_id, force_refresh=True)
+                for program_id in programs_to_fetch
+            ))
+
+            for program_id, details in zip(programs_to_fetch, results):
+                if details and "program" in details:
+                    prog = details["program"]
+                    # Build valve IDs from assignments
+                    valve_ids = [a.get("entityId") for a in prog.get("assignments", []) if a.get("entityId")]
+
+                    # Add to programs_map
+                    program_data = {
+                        "id": prog["id"],
+                        "name": prog.get("name", "Unknown Program"),
+                        "valveIds": valve_ids,
+                        "active": False,
+                        "enabled": prog.get("enabled", False),
+                        "programColor": prog.get("color", "#00A7E1"),
+                        "skippable": False,
+                        "color": prog.get("color", "#00A7E1"),
+                        "startOn": prog.get("startOn", {}),
+                        "dailyInterval": prog.get("dailyInterval", {}),
+                        "plannedRuns": prog.get("plannedRuns", []),
+                        "assignments": prog.get("assignments", []),
+                        "rainSkipEnabled": prog.get("rainSkipEnabled", False),
+                        "settings": prog.get("settings", {}),
                     }
-                }
 
+                    # Copy scheduling type fields
+                    if "daysOfWeek" in prog:
+                        program_data["daysOfWeek"] = prog["daysOfWeek"]
+                    if "evenDays" in prog:
+                        program_data["evenDays"] = prog["evenDays"]
+                    if "oddDays" in prog:
+                        program_data["oddDays"] = prog["oddDays"]
+
+                    # Add to schedules
+                    self.schedules.append(program_data)
+                    schedule_ids.add(program_data["id"])
+
+                    _LOGGER.info("Added disabled program '%s' (%s...) to schedules from entity registry", prog.get("name"), program_id[:8])
+                elif details is None:
+                    # Program was deleted - mark it and schedule for removal
+                    self._deleted_programs.add(program_id)
+                    programs_to_remove_at_startup.append(program_id)
+                    _LOGGER.info("Program %s from entity registry appears to be deleted - will remove entities", program_id)
+        except Exception as e:
+            _LOGGER.warning("Error checking entity registry for missing programs: %s", e)
 
-                data = await self._make_request(session, url, method="POST", json_data=payload)
-                #_LOGGER.debug(f"getValveDayViews API response (baseStationId={self.device_id}, end_days={summary_end_days}): {data}")
-
-                # Store raw valve_day_views data for calendar
-                self.valve_day_views = data.get("valveDayViews", []) if data else []
-
-                # Extract unique programs from the summary data
-                # Also parse run summaries for valves and programs
-                programs_map = {}  # programId -> program info
-                valve_run_history = {}  # valve_id -> list of runs
-                program_run_history = {}  # program_id -> list of runs
-                current_time = datetime.now(timezone.utc)
-
-                if data and "valveDayViews" in data:
-                    for day_view in data["valveDayViews"]:
-                        # Process program runs
-                        for program_run in day_view.get("valveProgramRunSummaries", []):
-                            program_id = program_run.get("programId")
-                            if program_id:
-                                # Store program info
-                                if program_id not in programs_map:
-                                    # Build valve list for this program
-                                    valve_ids = []
-                                    for valve_run in program_run.get("valveRunSummaries", []):
-                                        valve_id = valve_run.get("valveId")
-                                        if valve_id and valve_id not in valve_ids:
-                                            valve_ids.append(valve_id)
-
-                                    # Check if we have cached program details with enabled status
-                                    enabled_status = True  # Default to enabled if in schedule
-                                    if program_id in self._program_details:
-                                        cached_program = self._program_details[program_id]["details"].get("program", {})
-                                        enabled_status = cached_program.get("enabled", True)
-
-                                    programs_map[program_id] = {
-                                        "id": program_id,
-                                        "name": program_run.get("programName", "Unknown Program"),
-                                        "valveIds": valve_ids,
-                                        "active": False,  # Will be determined by running zones
-                                        "enabled": enabled_status,  # Use cached value if available
-                                        "programColor": program_run.get("programColor", "#00A7E1"),
-                                        "skippable": program_run.get("skippable", False),
-                                    }
+        # Remove entities for deleted programs found during startup
+        if programs_to_remove_at_startup:
+            await self._remove_program_entities(programs_to_remove_at_startup)
+            _LOGGER.info("Removed %s deleted program entities during startup", len(programs_to_remove_at_startup))
 
-                                # Store program run history
-                                if program_id not in program_run_history:
-                                    program_run_history[program_id] = []
+    async def async_update(self) -> None:
+        try:
+            # Commented out to reduce log noise (called on every update)
+            # _LOGGER.debug("Updating smart hose timer: %s", self.device_id)
 
-                                start_str = program_run.get("start")
-                                if start_str:
-                                    try:
-                                        start_time = datetime.fromisoformat(start_str.replace("Z", "+00:00"))
-
-                                        # Determine if this is a past or future run
-                                        is_future = start_time > current_time
-
-                                        # Extract all valve runs for this program
-                                        total_duration = 0
-                                        all_skipped = True
-                                        skip_info = None
-                                        manual_skip = False
-
-                                        for valve_run in program_run.get("valveRunSummaries", []):
-                                            duration = valve_run.get("durationSeconds", 0)
-                                            total_duration += duration
-
-                                            # Check if this valve run was skipped
-                                            if valve_run.get("skip"):
-                                                skip_info = valve_run.get("skip", {})
-                                                # Check for manual override trigger
-                                                if "manualOverrideTrigger" in skip_info:
-                                                    manual_skip = True
-                                            else:
-                                                all_skipped = False
-
-                                        run_info = {
-                                            "start": start_time,
-                                            "start_str": start_str,
-                                            "duration_seconds": program_run.get("totalRunDurationSeconds") or total_duration,
-                                            "skipped": all_skipped,
-                                            "manual_skip": manual_skip,
-                                            "skip_reason": skip_info.get("rainOverrideTrigger") if skip_info else None,
-                                            "predicted_precip_mm": skip_info.get("rainOverrideTrigger", {}).get("predictedPrecipMm") if skip_info else None,
-                                            "observed_precip_mm": skip_info.get("rainOverrideTrigger", {}).get("observedPrecipMm") if skip_info else None,
-                                            "skippable": program_run.get("skippable", False),
-                                            "is_future": is_future,
-                                        }
-
-                                        program_run_history[program_id].append(run_info)
-                                    except (ValueError, KeyError) as e:
-                                        _LOGGER.debug(f"Error parsing program run time: {e}")
-
-                                # Process valve runs from this program
-                                for valve_run in program_run.get("valveRunSummaries", []):
-                                    valve_id = valve_run.get("valveId")
-                                    if valve_id:
-                                        if valve_id not in valve_run_history:
-                                            valve_run_history[valve_id] = []
-
-                                        valve_start_str = valve_run.get("start")
-                                        if valve_start_str:
-                                            try:
-                                                valve_start_time = datetime.fromisoformat(valve_start_str.replace("Z", "+00:00"))
-                                                is_future = valve_start_time > current_time
-
-                                                valve_run_info = {
-                                                    "start": valve_start_time,
-                                                    "start_str": valve_start_str,
-                                                    "duration_seconds": valve_run.get("durationSeconds", 0),
-                                                    "flow_detected": valve_run.get("flowDetected"),
-                                                    "source": "program",
-                                                    "program_id": program_id,
-                                                    "program_name": program_run.get("programName", "Unknown"),
-                                                    "skipped": bool(valve_run.get("skip")),
-                                                    "is_future": is_future,
-                                                }
-                                                valve_run_history[valve_id].append(valve_run_info)
-                                            except (ValueError, KeyError) as e:
-                                                _LOGGER.debug(f"Error parsing valve run time from program: {e}")
-
-                        # Process quick runs (manual runs via app)
-                        for quick_run in day_view.get("valveQuickRunSummaries", []):
-                            for valve_run in quick_run.get("valveRunSummaries", []):
-                                valve_id = valve_run.get("valveId")
-                                if valve_id:
-                                    if valve_id not in valve_run_history:
-                                        valve_run_history[valve_id] = []
-
-                                    valve_start_str = valve_run.get("start")
-                                    if valve_start_str:
-                                        try:
-                                            valve_start_time = datetime.fromisoformat(valve_start_str.replace("Z", "+00:00"))
-                                            is_future = valve_start_time > current_time
-
-                                            valve_run_info = {
-                                                "start": valve_start_time,
-                                                "start_str": valve_start_str,
-                                                "duration_seconds": valve_run.get("durationSeconds", 0),
-                                                "flow_detected": valve_run.get("flowDetected"),
-                                                "source": "quick_run",
-                                                "is_future": is_future,
-                                            }
-                                            valve_run_history[valve_id].append(valve_run_info)
-                                        except (ValueError, KeyError) as e:
-                                            _LOGGER.debug(f"Error parsing valve run time from quick run: {e}")
-
-                # Process valve run history to extract previous and next runs
-                for valve_id, runs in valve_run_history.items():
-                    # Sort runs by start time
-                    sorted_runs = sorted(runs, key=lambda x: x["start"])
-
-                    # Find most recent past run and next future run
-                    previous_run = None
-                    next_run = None
-
-                    for run in reversed(sorted_runs):
-                        if not run["is_future"] and previous_run is None:
-                            previous_run = run
-                        if run["is_future"] and (next_run is None or run["start"] < next_run["start"]):
-                            next_run = run
-
-                    self.valve_run_summaries[valve_id] = {
-                        "previous_run": previous_run,
-                        "next_run": next_run,
-                    }
+            # Read the clock once per update; every freshness and running-state
+            # decision below is made against the same instant
+            update_started_dt = datetime.now(timezone.utc)
+            update_started = update_started_dt.timestamp()
+
+            # Programs (schedules) come from the getValveDayViews summary API
+            # This API returns program information including multi-valve programs
+            # Query the next 7 days to get scheduled program information
+            summary_url = f"{CLOUD_BASE_URL}/{SUMMARY_VALVE_VIEWS}"
+            # The summary window uses the local date, run classification below
+            # uses the same instant in UTC
+            current_time = update_started_dt
+            today = current_time.astimezone().date()
+
+            # Query 1 day in the past and N days in the future (user-configurable)
+            start_date = today - timedelta(days=1)
+            # Try to get summary_end_days from config entry options (per device)
+            summary_end_days = 7
+            if self.config_entry is not None:
+                config_key = f"{CONF_SUMMARY_END_DAYS}_{self.device_id}"
+                summary_end_days = self.config_entry.options.get(config_key, 7)
+            #_LOGGER.debug(f"[DEBUG] Using summary_end_days={summary_end_days} for {self.device_id}")
+            end_date = today + timedelta(days=summary_end_days)
+
+            payload = {
+                "start": {
+                    "year": start_date.year,
+                    "month": start_date.month,
+                    "day": start_date.day
+                },
+                "end": {
+                    "year": end_date.year,
+                    "month": end_date.month,
+                    "day": end_date.day
+                },
+                "resourceId": {
+                    "baseStationId": self.device_id
+                }
+            }
 
-                # Process program run history to extract previous and next runs
-                for program_id, runs in program_run_history.items():
-                    # Sort runs by start time
-                    sorted_runs = sorted(runs, key=lambda x: x["start"])
+            # The base station, valve list and summary endpoints are independent, so
+            # fetch them concurrently over the shared session (_make_request never raises)
+            base_url = f"{CLOUD_BASE_URL}{VALVE_GET_BASE_STATION_ENDPOINT.format(id=self.device_id)}"
+            valves_url = f"{CLOUD_BASE_URL}{VALVE_LIST_VALVES_ENDPOINT.format(baseStationId=self.device_id)}"
+            base_data, valves_data, data = await asyncio.gather(
+                self._make_request(base_url),
+                self._make_request(valves_url),
+                self._make_request(summary_url, method="POST", json_data=payload),
+            )
+
+            # Base station info
+            if base_data:
+                self.device_data = base_data
+                # Handle both single baseStation and array baseStations format
+                base_stations = base_data.get("baseStations", [])
+                if base_stations:
+                    base_station = base_stations[0]
+                else:
+                    base_station = base_data.get("baseStation", {})
+
+                state = base_station.get("reportedState", {})
+
+                # Update base station attributes
+                self.base_station_connected = state.get("connected", False)
+                # Prefer bleHubFirmwareVersion, fall back to firmwareVersion
+                self.base_station_firmware = state.get("bleHubFirmwareVersion") or state.get("firmwareVersion")
+                self.base_station_wifi_firmware = state.get("wifiBridgeFirmwareVersion")
+                self.base_station_mac = base_station.get("macAddress")
+                self.base_station_rssi = state.get("rssi")
+                self.status = "ONLINE" if state.get("connected") else "OFFLINE"
+            else:
+                self.device_data = {}
+                self.status = "OFFLINE"
+                self.base_station_connected = False
 
-                    # Find most recent past run and next future run
-                    previous_run = None
-                    next_run = None
+            # Valves (zones)
+            if valves_data:
+                self.zones = valves_data.get("valves", [])
+            else:
+                self.zones = []
+            self._zones_by_id = {zone.get("id"): zone for zone in self.zones}
+
+            # Programs (schedules) from the summary response
+            #_LOGGER.debug(f"getValveDayViews API response (baseStationId={self.device_id}, end_days={summary_end_days}): {data}")
+
+            # Store raw valve_day_views data for calendar
+            self.valve_day_views = data.get("valveDayViews", []) if data else []
+
+            # Extract unique programs from the summary data
+            # Also parse run summaries for valves and programs
+            programs_map = {}  # programId -> program info
+            valve_run_history = defaultdict(list)  # valve_id -> list of runs
+            program_run_history = defaultdict(list)  # program_id -> list of runs
+            parsed_starts = {}  # start string -> datetime, shared by program runs and their valve runs
+
+            if data and "valveDayViews" in data:
+                for day_view in data["valveDayViews"]:
+                    # Process program runs
+                    for program_run in day_view.get("valveProgramRunSummaries", []):
+                        pr_get = program_run.get
+                        program_id = pr_get("programId")
+                        if program_id:
+                            valve_runs = pr_get("valveRunSummaries", [])
+                            # Store program info
+                            if program_id not in programs_map:
+                                # Build valve list for this program (deduplicated, first-seen order)
+                                valve_ids = list(dict.fromkeys(
+                                    valve_id for valve_id in (vr.get("valveId") for vr in valve_runs) if valve_id
+                                ))
+
+                                # Check if we have cached program details with enabled status
+                                enabled_status = True  # Default to enabled if in schedule
+                                if program_id in self._program_details:
+                                    cached_program = self._program_details[program_id]["details"].get("program", {})
+                                    enabled_status = cached_program.get("enabled", True)
 
-                    for run in reversed(sorted_runs):
-                        if not run["is_future"] and previous_run is None:
-                            previous_run = run
-                        if run["is_future"] and (next_run is None or run["start"] < next_run["start"]):
-                            next_run = run
+                                programs_map[program_id] = {
+                                    "id": program_id,
+                                    "name": pr_get("programName", "Unknown Program"),
+                                    "valveIds": valve_ids,
+                                    "active": False,  # Will be determined by running zones
+                                    "enabled": enabled_status,  # Use cached value if available
+                                    "programColor": pr_get("programColor", "#00A7E1"),
+                                    "skippable": pr_get("skippable", False),
+                                }
 
-                    self.program_run_summaries[program_id] = {
-                        "previous_run": previous_run,
-                        "next_run": next_run,
-                    }
+                            # Store program run history
+                            program_runs = program_run_history[program_id]
 
-                # Also check for programs we've seen before but aren't in current summary
-                # (disabled programs won't appear in the summary but we still want to track them)
-                # BUT skip programs that have been confirmed as deleted
-                all_known_program_ids = set(programs_map.keys())
-                for cached_program_id in list(self._program_details.keys()):
-                    if cached_program_id not in all_known_program_ids:
-                        # Skip if we've already confirmed this program is deleted
-                        if cached_program_id in self._deleted_programs:
-                            _LOGGER.debug(f"Skipping cached program {cached_program_id} - already confirmed as deleted")
-                            continue
+                            start_str = pr_get("start")
+                            if start_str:
+                                try:
+                                    start_time = _parse_timestamp(start_str, parsed_starts)
+
+                                    # Determine if this is a past or future run
+                                    is_future = start_time > current_time
+
+                                    # Extract all valve runs for this program
+                                    total_duration = 0
+                                    all_skipped = True
+                                    skip_info = None
+                                    manual_skip = False
+
+                                    for valve_run in valve_runs:
+                                        vr_get = valve_run.get
+                                        total_duration += vr_get("durationSeconds", 0)
+
+                                        # Check if this valve run was skipped
+                                        skip = vr_get("skip")
+                                        if skip:
+                                            skip_info = skip
+                                            # Check for manual override trigger
+                                            if "manualOverrideTrigger" in skip_info:
+                                                manual_skip = True
+                                        else:
+                                            all_skipped = False
+
+                                    rain_trigger = skip_info.get("rainOverrideTrigger") if skip_info else None
+                                    rain = rain_trigger or {}
+                                    run_info = {
+                                        "start": start_time,
+                                        "start_str": start_str,
+                                        "duration_seconds": pr_get("totalRunDurationSeconds") or total_duration,
+                                        "skipped": all_skipped,
+                                        "manual_skip": manual_skip,
+                                        "skip_reason": rain_trigger,
+                                        "predicted_precip_mm": rain.get("predictedPrecipMm"),
+                                        "observed_precip_mm": rain.get("observedPrecipMm"),
+                                        "skippable": pr_get("skippable", False),
+                                        "is_future": is_future,
+                                    }
 
-                        # This program was cached but isn't in the current summary
-                        # It might be disabled - add it back to our schedules with full details
-                        cached_details = self._program_details[cached_program_id]["details"]
-                        if cached_details and "program" in cached_details:
-                            prog = cached_details["program"]
-                            if prog.get("id") not in programs_map:
-                                # Build valve IDs from assignments
-                                valve_ids = [a.get("entityId") for a in prog.get("assignments", []) if a.get("entityId")]
-
-                                programs_map[prog["id"]] = {
-                                    "id": prog["id"],
-                                    "name": prog.get("name", "Unknown Program"),
-                                    "valveIds": valve_ids,
-                                    "active": False,
-                                    "enabled": prog.get("enabled", False),
-                                    "programColor": prog.get("color", "#00A7E1"),
-                                    "skippable": False,
-                                    # Include all detailed fields from cache
-                                    "color": prog.get("color", "#00A7E1"),
-                                    "startOn": prog.get("startOn", {}),
-                                    "dailyInterval": prog.get("dailyInterval", {}),
-                                    "plannedRuns": prog.get("plannedRuns", []),
-                                    "assignments": prog.get("assignments", []),
-                                    "rainSkipEnabled": prog.get("rainSkipEnabled", False),
-                                    "settings": prog.get("settings", {}),
-                                }
+                                    program_runs.append(run_info)
+                                except (ValueError, KeyError) as e:
+                                    _LOGGER.debug("Error parsing program run time: %s", e)
 
-                                # Copy scheduling type fields
-                                if "daysOfWeek" in prog:
-                                    programs_map[prog["id"]]["daysOfWeek"] = prog["daysOfWeek"]
-                                if "evenDays" in prog:
-                                    programs_map[prog["id"]]["evenDays"] = prog["evenDays"]
-                                if "oddDays" in prog:
-                                    programs_map[prog["id"]]["oddDays"] = prog["oddDays"]
-
-                                _LOGGER.debug(f"Re-added cached program {prog['id']} ({prog.get('name')}) with full details - not in current summary (possibly disabled)")
-
-                # Filter out programs that are known to be deleted
-                all_programs = list(programs_map.values())
-                self.schedules = [p for p in all_programs if p.get("id") not in self._deleted_programs]
-
-                # Commented out to reduce log noise
-                # filtered_count = len(all_programs) - len(self.schedules)
-                # if filtered_count > 0:
-                #     _LOGGER.debug(f"Filtered out {filtered_count} deleted program(s) from schedules")
-
-                # During first update (startup), check for program entities that exist but aren't in schedules
-                # This handles disabled programs that have entities from a previous session
-                if not self._first_update_complete and self.hass:
-                    programs_to_remove_at_startup = []
-                    try:
-                        registry = er.async_get(self.hass)
-                        # Find all program sensor entities for this device
-                        for entry in list(registry.entities.values()):
-                            if entry.domain == "sensor" and entry.platform == DOMAIN:
-                                # Check if this is a program sensor for our device
-                                if entry.unique_id and entry.unique_id.startswith(f"{self.device_id}_program_"):
-                                    # Extract program_id from unique_id
-                                    program_id = entry.unique_id.replace(f"{self.device_id}_program_", "")
-
-                                    # If program is already marked as deleted, schedule it for removal
-                                    if program_id in self._deleted_programs:
-                                        programs_to_remove_at_startup.append(program_id)
-                                        _LOGGER.info(f"Found entity for already-deleted program {program_id} - will remove")
+                            # Process valve runs from this program
+                            program_name = pr_get("programName", "Unknown")
+                            for valve_run in valve_runs:
+                                valve_id = valve_run.get("valveId")
+                                if valve_id:
+                                    valve_runs_for_id = valve_run_history[valve_id]
+                                    try:
+                                        valve_run_info = _build_valve_run_info(
+                                            valve_run, current_time, parsed_starts, "program",
+                                            program_id=program_id,
+                                            program_name=program_name,
+                                            skipped=bool(valve_run.get("skip")),
+                                        )
+                                    except (ValueError, KeyError) as e:
+                                        _LOGGER.debug("Error parsing valve run time from program: %s", e)
                                         continue
+                                    if valve_run_info:
+                                        valve_runs_for_id.append(valve_run_info)
+
+                    # Process quick runs (manual runs via app)
+                    for quick_run in day_view.get("valveQuickRunSummaries", []):
+                        for valve_run in quick_run.get("valveRunSummaries", []):
+                            valve_id = valve_run.get("valveId")
+                            if valve_id:
+                                valve_runs_for_id = valve_run_history[valve_id]
+                                try:
+                                    valve_run_info = _build_valve_run_info(valve_run, current_time, parsed_starts, "quick_run")
+                                except (ValueError, KeyError) as e:
+                                    _LOGGER.debug("Error parsing valve run time from quick run: %s", e)
+                                    continue
+                                if valve_run_info:
+                                    valve_runs_for_id.append(valve_run_info)
+
+            # Process valve run history to extract previous and next runs
+            for valve_id, runs in valve_run_history.items():
+                previous_run, next_run = _find_previous_and_next_run(runs)
+                self.valve_run_summaries[valve_id] = {
+                    "previous_run": previous_run,
+                    "next_run": next_run,
+                }
 
-                                    # Check if this program is already in our schedules
-                                    program_exists = any(p.get("id") == program_id for p in self.schedules)
-
-                                    if not program_exists and program_id not in self._deleted_programs:
-                                        # This program has an entity but isn't in schedules
-                                        # It's likely disabled - fetch its details
-                                        _LOGGER.info(f"Found existing entity for program {program_id} not in schedules - will fetch details (likely disabled)")
-
-                                        # Fetch the program details
-                                        url = f"{CLOUD_BASE_URL}/{PROGRAM_GET_V2.format(id=program_id)}"
-                                        details = await self._make_request(session, url)
-
-                                        if details and "program" in details:
-                                            prog = details["program"]
-                                            # Build valve IDs from assignments
-                                            valve_ids = [a.get("entityId") for a in prog.get("assignments", []) if a.get("entityId")]
-
-                                            # Add to programs_map
-                                            program_data = {
-                                                "id": prog["id"],
-                                                "name": prog.get("name", "Unknown Program"),
-                                                "valveIds": valve_ids,
-                                                "active": False,
-                                                "enabled": prog.get("enabled", False),
-                                                "programColor": prog.get("color", "#00A7E1"),
-                                                "skippable": False,
-                                                "color": prog.get("color", "#00A7E1"),
-                                                "startOn": prog.get("startOn", {}),
-                                                "dailyInterval": prog.get("dailyInterval", {}),
-                                                "plannedRuns": prog.get("plannedRuns", []),
-                                                "assignments": prog.get("assignments", []),
-                                                "rainSkipEnabled": prog.get("rainSkipEnabled", False),
-                                                "settings": prog.get("settings", {}),
-                                            }
-
-                                            # Copy scheduling type fields
-                                            if "daysOfWeek" in prog:
-                                                program_data["daysOfWeek"] = prog["daysOfWeek"]
-                                            if "evenDays" in prog:
-                                                program_data["evenDays"] = prog["evenDays"]
-                                            if "oddDays" in prog:
-                                                program_data["oddDays"] = prog["oddDays"]
-
-                                            # Add to schedules
-                                            self.schedules.append(program_data)
-
-                                            # Cache the details
-                                            current_time_cache = time.time()
-                                            self._program_details[program_id] = {
-                                                "details": details,
-                                                "last_fetched": current_time_cache
-                                            }
-
-                                            _LOGGER.info(f"Added disabled program '{prog.get('name')}' ({program_id[:8]}...) to schedules from entity registry")
-                                        elif details is None:
-                                            # Program was deleted - mark it and schedule for removal
-                                            self._deleted_programs.add(program_id)
-                                            programs_to_remove_at_startup.append(program_id)
-                                            _LOGGER.info(f"Program {program_id} from entity registry appears to be deleted - will remove entities")
-                    except Exception as e:
-                        _LOGGER.warning(f"Error checking entity registry for missing programs: {e}")
-                    
-                    # Remove entities for deleted programs found during startup
-                    if programs_to_remove_at_startup:
-                        await self._remove_program_entities(programs_to_remove_at_startup)
-                        _LOGGER.info(f"Removed {len(programs_to_remove_at_startup)} deleted program entities during startup")
-
-                if self.schedules:
-                    # Commented out to reduce log noise (called on every update)
-                    # _LOGGER.debug(f"Found {len(self.schedules)} programs for device {self.device_id}")
-                    pass
-
-                    # Fetch detailed program information for new programs and hourly refresh
-                    programs_needing_details = []
-                    current_time = time.time()
+            # Process program run history to extract previous and next runs
+            for program_id, runs in program_run_history.items():
+                previous_run, next_run = _find_previous_and_next_run(runs)
+                self.program_run_summaries[program_id] = {
+                    "previous_run": previous_run,
+                    "next_run": next_run,
+                }
+
+            # Also check for programs we've seen before but aren't in current summary
+            # (disabled programs won't appear in the summary but we still want to track them)
+            # BUT skip programs that have been confirmed as deleted
+            known_ids = set(programs_map)
+            # Iterate the cache itself (not a set difference) so re-added programs keep a stable order
+            skip_ids = known_ids | self._deleted_programs
+            for cached_program_id in [pid for pid in self._program_details if pid not in skip_ids]:
+                # This program was cached but isn't in the current summary
+                # It might be disabled - add it back to our schedules with full details
+                cached_details = self._program_details[cached_program_id]["details"]
+                if cached_details and "program" in cached_details:
+                    prog = cached_details["program"]
+                    if prog.get("id") not in known_ids:
+                        known_ids.add(prog["id"])
+                        # Build valve IDs from assignments
+                        valve_ids = [a.get("entityId") for a in prog.get("assignments", []) if a.get("entityId")]
+
+                        programs_map[prog["id"]] = {
+                            "id": prog["id"],
+                            "name": prog.get("name", "Unknown Program"),
+                            "valveIds": valve_ids,
+                            "active": False,
+                            "enabled": prog.get("enabled", False),
+                            "programColor": prog.get("color", "#00A7E1"),
+                            "skippable": False,
+                            # Include all detailed fields from cache
+                            "color": prog.get("color", "#00A7E1"),
+                            "startOn": prog.get("startOn", {}),
+                            "dailyInterval": prog.get("dailyInterval", {}),
+                            "plannedRuns": prog.get("plannedRuns", []),
+                            "assignments": prog.get("assignments", []),
+                            "rainSkipEnabled": prog.get("rainSkipEnabled", False),
+                            "settings": prog.get("settings", {}),
+                        }
+
+                        # Copy scheduling type fields
+                        if "daysOfWeek" in prog:
+                            programs_map[prog["id"]]["daysOfWeek"] = prog["daysOfWeek"]
+                        if "evenDays" in prog:
+                            programs_map[prog["id"]]["evenDays"] = prog["evenDays"]
+                        if "oddDays" in prog:
+                            programs_map[prog["id"]]["oddDays"] = prog["oddDays"]
+
+                        _LOGGER.debug("Re-added cached program %s (%s) with full details - not in current summary (possibly disabled)", prog["id"], prog.get("name"))
+
+            # Filter out programs that are known to be deleted
+            deleted_programs = self._deleted_programs
+            self.schedules = [p for p in programs_map.values() if p.get("id") not in deleted_programs]
 
+            # Commented out to reduce log noise
+            # filtered_count = len(programs_map) - len(self.schedules)
+            # if filtered_count > 0:
+            #     _LOGGER.debug(f"Filtered out {filtered_count} deleted program(s) from schedules")
+
+            if self.schedules:
+                # Commented out to reduce log noise (called on every update)
+                # _LOGGER.debug(f"Found {len(self.schedules)} programs for device {self.device_id}")
+                pass
+
+                # Fetch detailed program information for new programs and hourly refresh
+                current_time = update_started
+                schedules_by_id = {p["id"]: p for p in self.schedules if p.get("id")}
+
+                # Skip programs that are known to be deleted, then fetch details if:
+                # 1. This is the first update (startup)
+                # 2. Program is new (not in cache)
+                # 3. Cache is stale (older than refresh interval)
+                live_ids = schedules_by_id.keys() - self._deleted_programs
+                if self._first_update_complete:
+                    fresh_ids = {
+                        program_id
+                        for program_id in live_ids & self._program_details.keys()
+                        if self._is_program_details_fresh(program_id, current_time)
+                    }
+                else:
+                    # Force refresh all programs on first update
+                    fresh_ids = set()
+                programs_needing_details = list(live_ids - fresh_ids)
+
+                # Apply cached details to programs whose cache is still valid
+                for program_id in fresh_ids:
+                    fields = self._program_details[program_id]["fields"]
+                    if fields is not None:
+                        # Merge cached details into program data
+                        schedules_by_id[program_id].update(fields)
+
+                # Fetch program details for programs that need it
+                if programs_needing_details:
+                    _LOGGER.info("Fetching details for %s program(s)", len(programs_needing_details))
+                    programs_to_remove = []  # Track programs that failed to fetch (likely deleted)
+
+                    # Fetch all programs concurrently (bounded by the details semaphore)
+                    results = await asyncio.gather(*(
+                        self._fetch_program_details(program_id, force_refresh=True)
+                        for program_id in programs_needing_details
+                    ))
+                    for program_id, details in zip(programs_needing_details, results):
+                        if details:
+                            _LOGGER.debug("Received details for program %s: keys=%s", program_id, list(details.keys()))
+                            # Extract the program object from the response
+                            program_details = details.get("program", {})
+                            _LOGGER.debug("Program details keys for %s: %s", program_id, list(program_details.keys()))
+
+                            # Merge details into program data
+                            program = schedules_by_id.get(program_id)
+                            if program is not None:
+                                # Update enabled status and other details from API
+                                _merge_program_details(program, program_details)
+
+                                # Legacy fields for backward compatibility
+                                program["schedule"] = program_details.get("schedule", {})
+                                program["durationSeconds"] = program_details.get("durationSeconds")
+                                program["createdAt"] = program_details.get("createdAt")
+                                program["updatedAt"] = program_details.get("updatedAt")
+
+                                _LOGGER.info("Updated program '%s' (%s...) - enabled=%s, rainSkip=%s, startOn=%s, interval=%s, plannedRuns=%s run(s), valves=%s", program.get("name"), program_id[:8], program["enabled"], program["rainSkipEnabled"], program.get("startOn"), program.get("dailyInterval"), len(program.get("plannedRuns", [])), len(program.get("valveIds", [])))
+                                _LOGGER.debug("Program %s now has keys: %s", program_id, list(program.keys()))
+                        else:
+                            # Program details returned None - likely deleted from Rachio
+                            _LOGGER.warning("Failed to fetch details for program %s - details returned None or empty (program may have been deleted)", program_id)
+                            programs_to_remove.append(program_id)
+
+                    # Remove deleted programs from cache and schedules
+                    if programs_to_remove:
+                        for program_id in programs_to_remove:
+                            # Remove from cache
+                            if self._program_details.pop(program_id, None) is not None:
+                                _LOGGER.info("Removed program %s from cache (deleted from Rachio)", program_id)
+
+                            # Remove from sensor and button tracking sets
+                            if hasattr(self, '_program_sensor_ids') and program_id in self._program_sensor_ids:
+                                self._program_sensor_ids.discard(program_id)
+                                _LOGGER.debug("Removed program %s from sensor tracking", program_id)
+
+                            if hasattr(self, '_program_button_ids') and program_id in self._program_button_ids:
+                                self._program_button_ids.discard(program_id)
+                                _LOGGER.debug("Removed program %s from button tracking", program_id)
+
+                            # Add to deleted programs set to prevent future API calls
+                            self._deleted_programs.add(program_id)
+                            _LOGGER.debug("Added program %s to deleted programs set", program_id)
+
+                        # Remove from schedules in a single pass
+                        to_remove = set(programs_to_remove)
+                        self.schedules = [p for p in self.schedules if p.get("id") not in to_remove]
+
+                        # Remove entities from entity registry (for both enabled and disabled entities).
+                        # The programs are already in _deleted_programs, so this can finish after the
+                        # update returns; removal skips entities that are already gone.
+                        if self.hass:
+                            self.hass.async_create_task(self._remove_program_entities(programs_to_remove))
+
+                        _LOGGER.info("Removed %s deleted program(s) from integration", len(programs_to_remove))
+
+                # Mark first update as complete after fetching all program details
+                if not self._first_update_complete:
+                    self._first_update_complete = True
+                    _LOGGER.debug("First update complete - subsequent updates will use cached program details")
+
+                # Dynamically create sensors and buttons for new programs
+                # (tracking sets exist once the sensor/button platforms are set up)
+                track_sensors = hasattr(self, '_program_sensor_ids') and hasattr(self, '_sensor_add_entities_callback')
+                track_buttons = hasattr(self, '_program_button_ids') and hasattr(self, '_button_add_entities_callback')
+                # The per-program tracking logs below evaluate their arguments eagerly
+                debug_enabled = _LOGGER.isEnabledFor(logging.DEBUG)
+                if track_buttons and debug_enabled:
+                    _LOGGER.debug("Button creation check: has _program_button_ids=%s, has callback=%s, tracked_ids=%s", hasattr(self, "_program_button_ids"), hasattr(self, "_button_add_entities_callback"), self._program_button_ids if hasattr(self, "_program_button_ids") else "N/A")
+
+                new_programs = []
+                new_program_buttons = []
+                if track_sensors or track_buttons:
+                    sensor_ids = self._program_sensor_ids if track_sensors else None
+                    button_ids = self._program_button_ids if track_buttons else None
                     for program in self.schedules:
                         program_id = program.get("id")
-                        if program_id:
-                            # Skip programs that are known to be deleted
-                            if program_id in self._deleted_programs:
-                                # Commented out to reduce log noise
-                                # _LOGGER.debug(f"Program {program_id} is in deleted set, skipping API call")
-                                continue
+                        if track_buttons and debug_enabled:
+                            _LOGGER.debug("Checking program %s (%s): in_tracked_set=%s", program_id, program.get("name"), program_id in button_ids if program_id else "N/A")
+                        if not program_id:
+                            continue
+                        if track_sensors and program_id not in sensor_ids:
+                            new_programs.append(program)
+                            sensor_ids.add(program_id)
+                            _LOGGER.info("Detected new program: %s", program.get("name", program_id))
+                        if track_buttons and program_id not in button_ids:
+                            new_program_buttons.append(program)
+                            button_ids.add(program_id)
+                            _LOGGER.debug("Detected new program for button creation: %s", program.get("name", program_id))
+
+                if new_programs:
+                    # Import here to avoid circular dependency
+                    from .sensor import RachioSmartHoseTimerProgramSensor
+                    new_sensors = [
+                        RachioSmartHoseTimerProgramSensor(self.coordinator, self, program)
+                        for program in new_programs
+                    ]
+                    self._sensor_add_entities_callback(new_sensors)
+                    _LOGGER.info("Added %s new program sensors", len(new_sensors))
+
+                if new_program_buttons:
+                    # Import here to avoid circular dependency
+                    from .button import RachioRefreshProgramButton
+                    new_buttons = [
+                        RachioRefreshProgramButton(self.coordinator, self, program)
+                        for program in new_program_buttons
+                    ]
+                    self._button_add_entities_callback(new_buttons)
+                    _LOGGER.info("Added %s new program refresh buttons", len(new_buttons))
+                elif track_buttons:
+                    _LOGGER.debug("No new buttons to create (all %s programs already tracked)", len(self.schedules))
+            else:
+                _LOGGER.debug("No programs configured for device %s", self.device_id)
 
-                            # Fetch details if:
-                            # 1. This is the first update (startup)
-                            # 2. Program is new (not in cache)
-                            # 3. Cache is stale (older than refresh interval)
-                            should_fetch = False
+            # Detect running zones by calculating if lastWateringAction is still active
+            running_zones = {}
 
-                            if not self._first_update_complete:
-                                # Force refresh all programs on first update
-                                should_fetch = True
-                                # Commented out to reduce log noise
-                                # _LOGGER.debug(f"Program {program_id} fetching on startup")
-                            elif program_id not in self._program_details:
-                                should_fetch = True
-                                # Commented out to reduce log noise
-                                # _LOGGER.debug(f"Program {program_id} is new, will fetch details")
-                            else:
-                                cache_age = current_time - self._program_details[program_id]["last_fetched"]
-                                if cache_age >= self._program_details_refresh_interval:
-                                    should_fetch = True
-                                    # Commented out to reduce log noise
-                                    # _LOGGER.debug(f"Program {program_id} cache is stale ({cache_age:.0f}s), will refresh")
-                                else:
-                                    # Apply cached details to program if cache is still valid
-                                    cached_details = self._program_details[program_id]["details"]
-                                    if cached_details and "program" in cached_details:
-                                        program_details = cached_details["program"]
-                                        # Merge cached details into program data
-                                        program["enabled"] = program_details.get("enabled", True)
-                                        program["color"] = program_details.get("color", "#00A7E1")
-                                        program["startOn"] = program_details.get("startOn", {})
-                                        program["dailyInterval"] = program_details.get("dailyInterval", {})
-                                        program["plannedRuns"] = program_details.get("plannedRuns", [])
-                                        program["assignments"] = program_details.get("assignments", [])
-                                        program["rainSkipEnabled"] = program_details.get("rainSkipEnabled", False)
-                                        program["settings"] = program_details.get("settings", {})
-
-                                        # Copy scheduling type fields (daysOfWeek, evenDays, oddDays)
-                                        if "daysOfWeek" in program_details:
-                                            program["daysOfWeek"] = program_details["daysOfWeek"]
-                                        if "evenDays" in program_details:
-                                            program["evenDays"] = program_details["evenDays"]
-                                        if "oddDays" in program_details:
-                                            program["oddDays"] = program_details["oddDays"]
-
-                                        # Update valveIds from assignments to get complete list
-                                        # (summary API may only show valves from a specific run)
-                                        if program_details.get("assignments"):
-                                            valve_ids = [a.get("entityId") for a in program_details["assignments"] if a.get("entityId")]
-                                            if valve_ids:
-                                                program["valveIds"] = valve_ids
-
-                                        # Legacy fields for backward compatibility (may not exist for Smart Hose Timers)
-                                        if program_details.get("schedule"):
-                                            program["schedule"] = program_details["schedule"]
-                                        if program_details.get("durationSeconds"):
-                                            program["durationSeconds"] = program_details["durationSeconds"]
-                                        if program_details.get("createdAt"):
-                                            program["createdAt"] = program_details["createdAt"]
-                                        if program_details.get("updatedAt"):
-                                            program["updatedAt"] = program_details["updatedAt"]
-
-                            if should_fetch:
-                                programs_needing_details.append(program_id)
-
-                    # Fetch program details for programs that need it
-                    if programs_needing_details:
-                        _LOGGER.info(f"Fetching details for {len(programs_needing_details)} program(s)")
-                        programs_to_remove = []  # Track programs that failed to fetch (likely deleted)
-
-                        for program_id in programs_needing_details:
-                            _LOGGER.debug(f"Calling _fetch_program_details for program {program_id}")
-                            details = await self._fetch_program_details(session, program_id, force_refresh=True)
-                            if details:
-                                _LOGGER.debug(f"Received details for program {program_id}: keys={list(details.keys())}")
-                                # Extract the program object from the response
-                                program_details = details.get("program", {})
-                                _LOGGER.debug(f"Program details keys for {program_id}: {list(program_details.keys())}")
-
-                                # Merge details into program data
-                                for program in self.schedules:
-                                    if program.get("id") == program_id:
-                                        # Update enabled status and other details from API
-                                        program["enabled"] = program_details.get("enabled", True)
-                                        program["color"] = program_details.get("color", "#00A7E1")
-                                        program["startOn"] = program_details.get("startOn", {})
-                                        program["dailyInterval"] = program_details.get("dailyInterval", {})
-                                        program["plannedRuns"] = program_details.get("plannedRuns", [])
-                                        program["assignments"] = program_details.get("assignments", [])
-                                        program["rainSkipEnabled"] = program_details.get("rainSkipEnabled", False)
-                                        program["settings"] = program_details.get("settings", {})
-
-                                        # Copy scheduling type fields (daysOfWeek, evenDays, oddDays)
-                                        if "daysOfWeek" in program_details:
-                                            program["daysOfWeek"] = program_details["daysOfWeek"]
-                                        if "evenDays" in program_details:
-                                            program["evenDays"] = program_details["evenDays"]
-                                        if "oddDays" in program_details:
-                                            program["oddDays"] = program_details["oddDays"]
-
-                                        # Update valveIds from assignments to get complete list
-                                        # (summary API may only show valves from a specific run)
-                                        if program_details.get("assignments"):
-                                            valve_ids = [a.get("entityId") for a in program_details["assignments"] if a.get("entityId")]
-                                            if valve_ids:
-                                                old_valve_ids = program.get("valveIds", [])
-                                                program["valveIds"] = valve_ids
-                                                _LOGGER.debug(f"Program {program_id} valveIds updated from {len(old_valve_ids)} to {len(valve_ids)} valves")
-
-                                        # Legacy fields for backward compatibility
-                                        program["schedule"] = program_details.get("schedule", {})
-                                        program["durationSeconds"] = program_details.get("durationSeconds")
-                                        program["createdAt"] = program_details.get("createdAt")
-                                        program["updatedAt"] = program_details.get("updatedAt")
-
-                                        _LOGGER.info(f"Updated program '{program.get('name')}' ({program_id[:8]}...) - enabled={program['enabled']}, rainSkip={program['rainSkipEnabled']}, startOn={program.get('startOn')}, interval={program.get('dailyInterval')}, plannedRuns={len(program.get('plannedRuns', []))} run(s), valves={len(program.get('valveIds', []))}")
-                                        _LOGGER.debug(f"Program {program_id} now has keys: {list(program.keys())}")
-                                        break
-                            else:
-                                # Program details returned None - likely deleted from Rachio
-                                _LOGGER.warning(f"Failed to fetch details for program {program_id} - details returned None or empty (program may have been deleted)")
-                                programs_to_remove.append(program_id)
-
-                        # Remove deleted programs from cache and schedules
-                        if programs_to_remove:
-                            for program_id in programs_to_remove:
-                                # Remove from cache
-                                if program_id in self._program_details:
-                                    del self._program_details[program_id]
-                                    _LOGGER.info(f"Removed program {program_id} from cache (deleted from Rachio)")
-
-                                # Remove from schedules list
-                                self.schedules = [p for p in self.schedules if p.get("id") != program_id]
-
-                                # Remove from sensor and button tracking sets
-                                if hasattr(self, '_program_sensor_ids') and program_id in self._program_sensor_ids:
-                                    self._program_sensor_ids.discard(program_id)
-                                    _LOGGER.debug(f"Removed program {program_id} from sensor tracking")
-
-                                if hasattr(self, '_program_button_ids') and program_id in self._program_button_ids:
-                                    self._program_button_ids.discard(program_id)
-                                    _LOGGER.debug(f"Removed program {program_id} from button tracking")
-
-                                # Add to deleted programs set to prevent future API calls
-                                self._deleted_programs.add(program_id)
-                                _LOGGER.debug(f"Added program {program_id} to deleted programs set")
-
-                            # Remove entities from entity registry (for both enabled and disabled entities)
-                            await self._remove_program_entities(programs_to_remove)
-
-                            _LOGGER.info(f"Removed {len(programs_to_remove)} deleted program(s) from integration")
-
-                    # Mark first update as complete after fetching all program details
-                    if not self._first_update_complete:
-                        self._first_update_complete = True
-                        _LOGGER.debug("First update complete - subsequent updates will use cached program details")
-
-                    # Dynamically create sensors for new programs
-                    if hasattr(self, '_program_sensor_ids') and hasattr(self, '_sensor_add_entities_callback'):
-                        new_programs = []
-                        for program in self.schedules:
-                            program_id = program.get("id")
-                            if program_id and program_id not in self._program_sensor_ids:
-                                new_programs.append(program)
-                                self._program_sensor_ids.add(program_id)
-                                _LOGGER.info(f"Detected new program: {program.get('name', program_id)}")
-
-                        if new_programs:
-                            # Import here to avoid circular dependency
-                            from .sensor import RachioSmartHoseTimerProgramSensor
-                            new_sensors = [
-                                RachioSmartHoseTimerProgramSensor(self.coordinator, self, program)
-                                for program in new_programs
-                            ]
-                            self._sensor_add_entities_callback(new_sensors)
-                            _LOGGER.info(f"Added {len(new_sensors)} new program sensors")
-
-                    # Dynamically create buttons for new programs
-                    if hasattr(self, '_program_button_ids') and hasattr(self, '_button_add_entities_callback'):
-                        _LOGGER.debug(f"Button creation check: has _program_button_ids={hasattr(self, '_program_button_ids')}, has callback={hasattr(self, '_button_add_entities_callback')}, tracked_ids={self._program_button_ids if hasattr(self, '_program_button_ids') else 'N/A'}")
-                        new_program_buttons = []
-                        for program in self.schedules:
-                            program_id = program.get("id")
-                            _LOGGER.debug(f"Checking program {program_id} ({program.get('name')}): in_tracked_set={program_id in self._program_button_ids if program_id else 'N/A'}")
-                            if program_id and program_id not in self._program_button_ids:
-                                new_program_buttons.append(program)
-                                self._program_button_ids.add(program_id)
-                                _LOGGER.debug(f"Detected new program for button creation: {program.get('name', program_id)}")
-
-                        if new_program_buttons:
-                            # Import here to avoid circular dependency
-                            from .button import RachioRefreshProgramButton
-                            new_buttons = [
-                                RachioRefreshProgramButton(self.coordinator, self, program)
-                                for program in new_program_buttons
-                            ]
-                            self._button_add_entities_callback(new_buttons)
-                            _LOGGER.info(f"Added {len(new_buttons)} new program refresh buttons")
-                        else:
-                            _LOGGER.debug(f"No new buttons to create (all {len(self.schedules)} programs already tracked)")
-                else:
-                    _LOGGER.debug(f"No programs configured for device {self.device_id}")
+            # Track which valves were running last cycle (to detect completions)
+            previously_running = set(self.running_zones.keys())
 
-                # Detect running zones by calculating if lastWateringAction is still active
-                running_zones = {}
-                current_time = datetime.now()
+            _LOGGER.debug("Checking %s valves for running/completed status", len(self.zones))
 
-                # Track which valves were running last cycle (to detect completions)
-                previously_running = set(self.running_zones.keys())
+            now_utc = update_started_dt
+            now_naive = update_started_dt.astimezone().replace(tzinfo=None)
 
-                _LOGGER.debug(f"Checking {len(self.zones)} valves for running/completed status")
+            # Bind the per-valve state dicts once for the loop below
+            parsed_actions = self._parsed_actions
+            force_stopped = self._force_stopped
+            last_completed_times = self._last_watering_completed
+            expected_end_times = self._expected_end_times
 
-                for valve in self.zones:
-                    valve_id = valve["id"]
-                    state = valve.get("state", {}).get("reportedState", {})
-                    last_action = state.get("lastWateringAction", {})
+            for valve in self.zones:
+                # Idle valves have no lastWateringAction; skip them before any parsing
+                state = valve.get("state")
+                reported = state.get("reportedState") if state else None
+                last_action = reported.get("lastWateringAction") if reported else None
+                if not last_action:
+                    continue
+                valve_id = valve["id"]
 
+                # Commented out to reduce log noise (verbose debugging)
+                # _LOGGER.debug(f"Valve {valve_id}: has lastWateringAction={last_action is not None and len(last_action) > 0}, has start={last_action.get('start') is not None}, has duration={last_action.get('durationSeconds') is not None}")
+
+                # Check if there's a watering action with start time and duration
+                if last_action.get("start") and last_action.get("durationSeconds"):
                     # Commented out to reduce log noise (verbose debugging)
-                    # _LOGGER.debug(f"Valve {valve_id}: has lastWateringAction={last_action is not None and len(last_action) > 0}, has start={last_action.get('start') is not None}, has duration={last_action.get('durationSeconds') is not None}")
-
-                    # Check if there's a watering action with start time and duration
-                    if last_action.get("start") and last_action.get("durationSeconds"):
-                        # Commented out to reduce log noise (verbose debugging)
-                        # if last_action:
-                        #     _LOGGER.debug(f"Valve {valve_id} lastWateringAction keys: {list(last_action.keys())}")
-                        try:
+                    # if last_action:
+                    #     _LOGGER.debug(f"Valve {valve_id} lastWateringAction keys: {list(last_action.keys())}")
+                    try:
+                        # The same action is reported on every update while it runs (and
+                        # after), so reuse the parsed times until it changes
+                        action_key = (last_action["start"], last_action["durationSeconds"])
+                        parsed = parsed_actions.get(valve_id)
+                        if parsed is not None and parsed[0] == action_key:
+                            _, start_time, end_time, end_time_buffer = parsed
+                            duration_seconds = int(action_key[1])
+                        else:
                             # Parse the start time (ISO 8601 format)
-                            start_str = last_action["start"]
-                            # Handle both with and without milliseconds
-                            if "." in start_str:
-                                start_time = datetime.fromisoformat(start_str.replace("Z", "+00:00"))
-                            else:
-                                start_time = datetime.fromisoformat(start_str.replace("Z", "+00:00"))
+                            start_time = parse_iso_timestamp(action_key[0])
 
-                            duration_seconds = int(last_action["durationSeconds"])
+                            duration_seconds = int(action_key[1])
                             end_time = start_time + timedelta(seconds=duration_seconds)
 
                             # Add 30 second buffer for API lag
-                            end_time_buffer = end_time + timedelta(seconds=30)
+                            end_time_buffer = end_time + API_LAG_BUFFER
+                            parsed_actions[valve_id] = (action_key, start_time, end_time, end_time_buffer)
+
+                        # Make current_time timezone-aware if start_time is
+                        current_time = now_utc if start_time.tzinfo is not None else now_naive
+
+                        # Check if we force stopped this valve recently (within last 30 seconds)
+                        # This prevents race conditions where coordinator updates overwrite manual stops
+                        force_stop_time = force_stopped.get(valve_id)
+                        if force_stop_time is not None:
+                            time_since_stop = (current_time - force_stop_time).total_seconds()
+                            if time_since_stop < 30:  # Ignore API data for 30 seconds after force stop
+                                # Commented out to reduce log noise
+                                # _LOGGER.debug(f"Valve {valve_id} force stopped {time_since_stop:.0f}s ago, ignoring API data")
+                                continue
+                            else:
+                                # Clear old force stop tracking
+                                force_stopped.pop(valve_id, None)
+
+                        # Check if we manually stopped this valve recently
+                        # If so, ignore stale API data showing it's still running
+                        # But still allow completion time updates for newer runs
+                        last_completed = last_completed_times.get(valve_id)
+                        if last_completed is not None:
+                            # If the API action ended before our manual stop AND it's not currently running,
+                            # this is stale data - ignore it
+                            if end_time <= last_completed and start_time <= current_time <= end_time_buffer:
+                                # Commented out to reduce log noise
+                                # _LOGGER.debug(f"Valve {valve_id} ignoring stale API data showing as running (ended {end_time} vs last completed {last_completed})")
+                                continue
 
-                            # Make current_time timezone-aware if start_time is
-                            if start_time.tzinfo is not None:
-                                current_time = datetime.now(start_time.tzinfo)
+                        # Check if currently watering
+                        if start_time <= current_time <= end_time_buffer:
+                            remaining_seconds = (end_time - current_time).total_seconds()
+                            running_zones[valve_id] = {
+                                "id": valve_id,
+                                "remaining": max(0, remaining_seconds),
+                                "start_time": start_time,  # Store start time for program matching
+                                "duration": duration_seconds,
+                                # Store program ID if available in lastWateringAction
+                                "program_id": last_action.get("programId") or last_action.get("program_id"),
+                            }
+                            # Track expected end time for completion detection
+                            expected_end_times[valve_id] = end_time
+                            # Commented out to reduce log noise (called on every update when valve is running)
+                            # _LOGGER.debug(f"Valve {valve_id} is running, {remaining_seconds:.0f}s remaining, program_id={running_zones[valve_id].get('program_id')}, expected_end={end_time}")
+                        elif current_time > end_time_buffer:
+                            # Watering has completed, record/update completion time
+                            # Always update to ensure we capture the most recent completion
+                            old_completed = last_completed_times.get(valve_id)
+                            if old_completed is None or old_completed < end_time:
+                                last_completed_times[valve_id] = end_time
+                                _LOGGER.info("Valve %s watering completed at %s (was: %s)", valve_id, end_time, old_completed)
                             else:
-                                current_time = datetime.now()
-
-                            # Check if we force stopped this valve recently (within last 30 seconds)
-                            # This prevents race conditions where coordinator updates overwrite manual stops
-                            if valve_id in self._force_stopped:
-                                force_stop_time = self._force_stopped[valve_id]
-                                time_since_stop = (current_time - force_stop_time).total_seconds()
-                                if time_since_stop < 30:  # Ignore API data for 30 seconds after force stop
-                                    # Commented out to reduce log noise
-                                    # _LOGGER.debug(f"Valve {valve_id} force stopped {time_since_stop:.0f}s ago, ignoring API data")
-                                    continue
-                                else:
-                                    # Clear old force stop tracking
-                                    self._force_stopped.pop(valve_id, None)
-
-                            # Check if we manually stopped this valve recently
-                            # If so, ignore stale API data showing it's still running
-                            # But still allow completion time updates for newer runs
-                            if valve_id in self._last_watering_completed:
-                                last_completed = self._last_watering_completed[valve_id]
-                                # If the API action ended before our manual stop AND it's not currently running,
-                                # this is stale data - ignore it
-                                if end_time <= last_completed and start_time <= current_time <= end_time_buffer:
-                                    # Commented out to reduce log noise
-                                    # _LOGGER.debug(f"Valve {valve_id} ignoring stale API data showing as running (ended {end_time} vs last completed {last_completed})")
-                                    continue
+                                # Commented out to reduce log noise
+                                # _LOGGER.debug(f"Valve {valve_id} watering already completed at {old_completed}, API end_time {end_time} is not newer")
+                                pass
+                    except (ValueError, KeyError) as e:
+                        _LOGGER.warning("Error parsing watering times for valve %s: %s", valve_id, e)
+
+            # Merge API-detected running zones with optimistically-started zones
+            # This preserves valves we just started that the API hasn't caught up with yet
+            pending_now = time.monotonic()
+            for zone_id, zone_data in list(self.running_zones.items()):
+                # If a zone is in our current running_zones but not detected by API
+                if zone_id not in running_zones:
+                    # Check if it's still in pending_start (within 60s window)
+                    if self._pending_start.get(zone_id, 0) > pending_now:
+                        # Keep it in running_zones (API just hasn't caught up yet)
+                        running_zones[zone_id] = zone_data
+                        _LOGGER.debug("Valve %s keeping optimistic running state (still in pending window)", zone_id)
+
+            update_in_place(self.running_zones, running_zones)
+
+            # Detect completions: valves that were running but are no longer
+            # (The API removes lastWateringAction after completion, so we track expected end times)
+            # Every expected end time for a valve that isn't running any more is
+            # consumed here: recorded as a completion if the valve was running last
+            # cycle, otherwise just cleaned up
+            for valve_id in self._expected_end_times.keys() - running_zones.keys():
+                expected_end = self._expected_end_times.pop(valve_id)
+                if valve_id not in previously_running:
+                    continue
+                # Only record if this is a new or more recent completion
+                last_completed = self._last_watering_completed.get(valve_id)
+                if last_completed is None or last_completed < expected_end:
+                    self._last_watering_completed[valve_id] = expected_end
+                    _LOGGER.info("Valve %s detected as completed at %s (no longer running, API removed lastWateringAction)", valve_id, expected_end)
+
+            # Detect running schedules by matching running valves to programs based on timing
+            running_schedules = {}
+
+            # Commented out to reduce log noise (verbose debugging)
+            # if running_zones:
+            #     _LOGGER.debug(f"Currently running valves: {list(running_zones.keys())}")
+            #     for valve_id, zone_data in running_zones.items():
+            #         _LOGGER.debug(f"  Valve {valve_id}: start_time={zone_data.get('start_time')}, remaining={zone_data.get('remaining'):.0f}s")
+
+            # First, try to match running valves to programs using valve_run_summaries
+            # This contains the actual program association from the API
+            valve_to_program_map = {}  # valve_id -> program_id for currently running valves
+            planned_start_index = None  # Built on first use by the plannedRuns fallback below
+
+            for valve_id, zone_data in running_zones.items():
+                valve_start_time = zone_data.get("start_time")
+                if not valve_start_time:
+                    # Commented out to reduce log noise
+                    # _LOGGER.debug(f"Valve {valve_id} has no start_time, skipping program matching")
+                    continue
+                valve_start_ts = valve_start_time.timestamp()
+
+                # lastWateringAction's programId is authoritative; otherwise fall back to
+                # run summary timing, then to the programs' plannedRuns
+                program_id = zone_data.get("program_id")
+                if program_id:
+                    _LOGGER.info("Valve %s matched to program %s via lastWateringAction.programId", valve_id, program_id)
+                else:
+                    program_id = _match_by_run_summaries(self.valve_run_summaries.get(valve_id), valve_id, valve_start_ts)
+                if not program_id:
+                    if planned_start_index is None:
+                        planned_start_index = _build_planned_start_index(self.schedules)
+                    program_id = _match_by_planned_runs(planned_start_index, valve_id, valve_start_ts)
+                if program_id:
+                    valve_to_program_map[valve_id] = program_id
+
+            # Debug: Log valve-to-program mapping
+            if valve_to_program_map:
+                _LOGGER.debug("Valve-to-program mapping: %s", valve_to_program_map)
+            else:
+                _LOGGER.debug("No valves mapped to programs")
+
+            # Invert the mapping once so each program needs a single lookup
+            program_to_running_valves = defaultdict(list)
+            for valve_id, program_id in valve_to_program_map.items():
+                program_to_running_valves[program_id].append(valve_id)
+            unmapped_valves = running_zones.keys() - valve_to_program_map.keys()
+            if unmapped_valves:
+                # No mapping found - could be a quick run or manual run
+                # Don't attribute it to any program
+                _LOGGER.debug("Running valves not mapped to any program: %s", unmapped_valves)
+
+            # Now determine which programs are running based on valve-to-program mapping
+            for program in self.schedules:
+                program_id = program.get("id")
+                program_name = program.get("name")
+
+                # A program is running if any of its valves are running and mapped
+                # to this specific program (via timing analysis)
+                mapped_valves = program_to_running_valves.get(program_id)
+                if mapped_valves:
+                    valve_ids = program.get("valveIds", ())
+                    running_valves = [valve_id for valve_id in mapped_valves if valve_id in valve_ids]
+                else:
+                    running_valves = ()
 
-                            # Check if currently watering
-                            if start_time <= current_time <= end_time_buffer:
-                                remaining_seconds = (end_time - current_time).total_seconds()
-                                running_zones[valve_id] = {
-                                    "id": valve_id,
-                                    "remaining": max(0, remaining_seconds),
-                                    "start_time": start_time,  # Store start time for program matching
-                                    "duration": duration_seconds,
-                                    # Store program ID if available in lastWateringAction
-                                    "program_id": last_action.get("programId") or last_action.get("program_id"),
-                                }
-                                # Track expected end time for completion detection
-                                self._expected_end_times[valve_id] = end_time
-                                # Commented out to reduce log noise (called on every update when valve is running)
-                                # _LOGGER.debug(f"Valve {valve_id} is running, {remaining_seconds:.0f}s remaining, program_id={running_zones[valve_id].get('program_id')}, expected_end={end_time}")
-                            elif current_time > end_time_buffer:
-                                # Watering has completed, record/update completion time
-                                # Always update to ensure we capture the most recent completion
-                                old_completed = self._last_watering_completed.get(valve_id)
-                                if valve_id not in self._last_watering_completed or self._last_watering_completed[valve_id] < end_time:
-                                    self._last_watering_completed[valve_id] = end_time
-                                    _LOGGER.info(f"Valve {valve_id} watering completed at {end_time} (was: {old_completed})")
-                                else:
-                                    # Commented out to reduce log noise
-                                    # _LOGGER.debug(f"Valve {valve_id} watering already completed at {old_completed}, API end_time {end_time} is not newer")
-                                    pass
-                        except (ValueError, KeyError) as e:
-                            _LOGGER.warning(f"Error parsing watering times for valve {valve_id}: {e}")
-
-                # Merge API-detected running zones with optimistically-started zones
-                # This preserves valves we just started that the API hasn't caught up with yet
-                for zone_id, zone_data in list(self.running_zones.items()):
-                    # If a zone is in our current running_zones but not detected by API
-                    if zone_id not in running_zones:
-                        # Check if it's still in pending_start (within 60s window)
-                        if zone_id in self._pending_start:
-                            import time as time_module
-                            if self._pending_start[zone_id] > time_module.time():
-                                # Keep it in running_zones (API just hasn't caught up yet)
-                                running_zones[zone_id] = zone_data
-                                _LOGGER.debug(f"Valve {zone_id} keeping optimistic running state (still in pending window)")
-
-                self.running_zones = running_zones
-
-                # Detect completions: valves that were running but are no longer
-                # (The API removes lastWateringAction after completion, so we track expected end times)
-                for valve_id in previously_running:
-                    if valve_id not in running_zones and valve_id in self._expected_end_times:
-                        # Valve was running but is no longer - it has completed
-                        expected_end = self._expected_end_times[valve_id]
-                        # Only record if this is a new or more recent completion
-                        if valve_id not in self._last_watering_completed or self._last_watering_completed[valve_id] < expected_end:
-                            self._last_watering_completed[valve_id] = expected_end
-                            _LOGGER.info(f"Valve {valve_id} detected as completed at {expected_end} (no longer running, API removed lastWateringAction)")
-                        # Clean up the expected end time
-                        del self._expected_end_times[valve_id]
-
-                # Clean up expected end times for valves that are no longer running and already recorded as completed
-                for valve_id in list(self._expected_end_times.keys()):
-                    if valve_id not in running_zones:
-                        del self._expected_end_times[valve_id]
-
-                # Detect running schedules by matching running valves to programs based on timing
-                running_schedules = {}
+                is_running = len(running_valves) > 0
 
-                # Commented out to reduce log noise (verbose debugging)
-                # if running_zones:
-                #     _LOGGER.debug(f"Currently running valves: {list(running_zones.keys())}")
-                #     for valve_id, zone_data in running_zones.items():
-                #         _LOGGER.debug(f"  Valve {valve_id}: start_time={zone_data.get('start_time')}, remaining={zone_data.get('remaining'):.0f}s")
-
-                # First, try to match running valves to programs using valve_run_summaries
-                # This contains the actual program association from the API
-                valve_to_program_map = {}  # valve_id -> program_id for currently running valves
-
-                for valve_id, zone_data in running_zones.items():
-                    valve_start_time = zone_data.get("start_time")
-                    if not valve_start_time:
-                        # Commented out to reduce log noise
-                        # _LOGGER.debug(f"Valve {valve_id} has no start_time, skipping program matching")
-                        continue
-
-                    # First check if lastWateringAction directly provides program_id
-                    direct_program_id = zone_data.get("program_id")
-                    if direct_program_id:
-                        valve_to_program_map[valve_id] = direct_program_id
-                        _LOGGER.info(f"Valve {valve_id} matched to program {direct_program_id} via lastWateringAction.programId")
-                        continue
-
-                    # Check if this valve has a recent run in valve_run_summaries that matches timing
-                    if valve_id in self.valve_run_summaries:
-                        summaries = self.valve_run_summaries[valve_id]
-                        # Commented out to reduce log noise (verbose debugging)
-                        # _LOGGER.debug(f"Valve {valve_id} (started at {valve_start_time}) checking run summaries - previous_run: {summaries.get('previous_run') is not None}, next_run: {summaries.get('next_run') is not None}")
-
-                        # Check previous run (most recent past run - could be currently running)
-                        prev_run = summaries.get("previous_run")
-                        if prev_run:
-                            # Commented out to reduce log noise (verbose debugging)
-                            # _LOGGER.debug(f"  previous_run: source={prev_run.get('source')}, start={prev_run.get('start')}, program_id={prev_run.get('program_id')}")
-                            if prev_run.get("source") == "program":
-                                run_start = prev_run.get("start")
-                                if run_start:
-                                    time_diff = abs((run_start - valve_start_time).total_seconds())
-                                    # Commented out to reduce log noise (verbose debugging)
-                                    # _LOGGER.debug(f"  Time difference: {time_diff:.0f}s (threshold: 3600s)")
-                                    # If the run start time is within 1 hour of the valve start time, it's a match
-                                    # Increased threshold to handle API lag for manual program runs
-                                    if time_diff < 3600:
-                                        program_id = prev_run.get("program_id")
-                                        if program_id:
-                                            valve_to_program_map[valve_id] = program_id
-                                            _LOGGER.info(f"Valve {valve_id} matched to program {program_id} via previous_run timing (diff: {time_diff:.0f}s)")
-                                            continue
-
-                        # Check next run (scheduled future run - might have just started)
-                        next_run = summaries.get("next_run")
-                        if next_run:
-                            # Commented out to reduce log noise (verbose debugging)
-                            # _LOGGER.debug(f"  next_run: source={next_run.get('source')}, start={next_run.get('start')}, program_id={next_run.get('program_id')}")
-                            if next_run.get("source") == "program":
-                                run_start = next_run.get("start")
-                                if run_start:
-                                    time_diff = abs((run_start - valve_start_time).total_seconds())
-                                    # Commented out to reduce log noise (verbose debugging)
-                                    # _LOGGER.debug(f"  Time difference: {time_diff:.0f}s (threshold: 1800s)")
-                                    # If the scheduled start time is within 30 minutes of the valve start time, it's a match
-                                    if time_diff < 1800:
-                                        program_id = next_run.get("program_id")
-                                        if program_id:
-                                            valve_to_program_map[valve_id] = program_id
-                                            _LOGGER.info(f"Valve {valve_id} matched to program {program_id} via next_run timing (diff: {time_diff:.0f}s)")
-                                            continue
-
-                        # Commented out to reduce log noise
-                        # _LOGGER.debug(f"Valve {valve_id} could not be matched to any program (no timing match)")
-                    else:
-                        # Commented out to reduce log noise
-                        # _LOGGER.debug(f"Valve {valve_id} has no run summaries")
-                        pass
-
-                    # Fallback: Match based on program's next scheduled run time (from plannedRuns)
-                    if valve_id not in valve_to_program_map:
-                        # Find program with scheduled run closest to valve start time
-                        best_match = None
-                        best_time_diff = float('inf')
-
-                        for program in self.schedules:
-                            if valve_id not in program.get("valveIds", []):
-                                continue  # This program doesn't use this valve
-
-                            # Check plannedRuns for this program
-                            planned_runs = program.get("plannedRuns", [])
-                            for planned_run in planned_runs:
-                                # plannedRuns contains start time info
-                                start_info = planned_run.get("start", {})
-                                if start_info:
-                                    try:
-                                        # Parse the planned start time
-                                        year = start_info.get("year")
-                                        month = start_info.get("month")
-                                        day = start_info.get("day")
-                                        hour = start_info.get("hour", 0)
-                                        minute = start_info.get("minute", 0)
-
-                                        if year and month and day:
-                                            planned_start = datetime(year, month, day, hour, minute, tzinfo=timezone.utc)
-                                            time_diff = abs((planned_start - valve_start_time).total_seconds())
-
-                                            _LOGGER.debug(f"  Program {program.get('id')} ({program.get('name')}): planned_start={planned_start}, diff={time_diff:.0f}s")
-
-                                            if time_diff < best_time_diff:
-                                                best_time_diff = time_diff
-                                                best_match = program.get("id")
-                                    except Exception as e:
-                                        _LOGGER.debug(f"Error parsing planned run time for program {program.get('id')}: {e}")
-
-                        if best_match and best_time_diff < 3600:  # Within 1 hour
-                            valve_to_program_map[valve_id] = best_match
-                            _LOGGER.info(f"Valve {valve_id} matched to program {best_match} via plannedRuns timing (diff: {best_time_diff:.0f}s)")
-                        elif best_match:
-                            _LOGGER.debug(f"Best program match for valve {valve_id} is {best_match} but time diff ({best_time_diff:.0f}s) exceeds 1 hour - likely a manual run")
-
-                # Debug: Log valve-to-program mapping
-                if valve_to_program_map:
-                    _LOGGER.debug(f"Valve-to-program mapping: {valve_to_program_map}")
+                # Update the program's active state
+                program["active"] = is_running
+
+                if is_running:
+                    # Calculate remaining time for this program (max of all its running valves)
+                    max_remaining = max(running_zones[valve_id].get("remaining", 0) for valve_id in running_valves)
+
+                    program["remaining"] = max_remaining
+                    running_schedules[program_id] = program
+                    _LOGGER.info("Program %s (%s...) is RUNNING - %s valve(s) active, %.0fs remaining", program_name, program_id[:8], len(running_valves), max_remaining)
                 else:
-                    _LOGGER.debug("No valves mapped to programs")
-
-                # Now determine which programs are running based on valve-to-program mapping
-                for program in self.schedules:
-                    program_id = program.get("id")
-                    valve_ids = program.get("valveIds", [])
-
-                    # Check if any of this program's valves are:
-                    # 1. Currently running AND
-                    # 2. Mapped to this specific program (via timing analysis)
-                    running_valves = []
-                    for valve_id in valve_ids:
-                        if valve_id in running_zones:
-                            # Valve is running - check if it's mapped to this program
-                            if valve_to_program_map.get(valve_id) == program_id:
-                                running_valves.append(valve_id)
-                                _LOGGER.debug(f"Program {program_id} ({program.get('name')}): valve {valve_id} matched")
-                            elif valve_id not in valve_to_program_map:
-                                # No mapping found - could be a quick run or manual run
-                                # Don't attribute it to any program
-                                _LOGGER.debug(f"Program {program_id} ({program.get('name')}): valve {valve_id} running but not mapped to any program")
-
-                    is_running = len(running_valves) > 0
-
-                    # Update the program's active state
-                    program["active"] = is_running
-
-                    if is_running:
-                        # Calculate remaining time for this program (max of all its running valves)
-                        max_remaining = 0
-                        for valve_id in running_valves:
-                            remaining = running_zones[valve_id].get("remaining", 0)
-                            max_remaining = max(max_remaining, remaining)
-
-                        program["remaining"] = max_remaining
-                        running_schedules[program_id] = program
-                        _LOGGER.info(f"Program {program.get('name')} ({program_id[:8]}...) is RUNNING - {len(running_valves)} valve(s) active, {max_remaining:.0f}s remaining")
-                    else:
-                        _LOGGER.debug(f"Program {program_id} ({program.get('name')}): not running (0 matched valves)")
-
-                self.running_schedules = running_schedules
+                    _LOGGER.debug("Program %s (%s): not running (0 matched valves)", program_id, program_name)
+
+            update_in_place(self.running_schedules, running_schedules)
         except Exception as err:
             _LOGGER.error("Error updating smart hose timer: %s", err)
             raise
 
     def _is_valve_connected(self, zone_id):
         """Check if a specific valve is connected to the base station."""
-        for valve in self.zones:
-            if valve["id"] == zone_id:
-                state = valve.get("state", {}).get("reportedState", {})
-                return state.get("connected", False)
-        return False
+        valve = self._zones_by_id.get(zone_id)
+        if valve is None:
+            return False
+        return valve.get("state", {}).get("reportedState", {}).get("connected", False)
+
+    def _parsed_action_start(self, zone_id, start_str):
+        """Return the parsed start of a valve's lastWateringAction, reusing the update's parse."""
+        parsed = self._parsed_actions.get(zone_id)
+        if parsed is not None and parsed[0][0] == start_str:
+            return parsed[1]
+        return parse_iso_timestamp(start_str)
+
+    def _mark_pending(self, item_id):
+        """Show a valve or program as on for the optimistic window after a start command."""
+        self._pending_start[item_id] = time.monotonic() + self.OPTIMISTIC_WINDOW
+
+    def _mark_started(self, zone_id, duration):
+        """Record an optimistic start for a valve after a successful start command."""
+        # Always mark as pending (for optimistic UI updates)
+        # But only add to running_zones if both base station AND valve are connected
+        self._mark_pending(zone_id)
+        base_station_connected = self.base_station_connected
+        valve_connected = self._is_valve_connected(zone_id)
+        if base_station_connected and valve_connected:
+            self.running_zones[zone_id] = {"id": zone_id, "remaining": duration}
+            _LOGGER.debug("Valve %s start command sent - marked as running (base station and valve connected)", zone_id)
+        elif not base_station_connected:
+            _LOGGER.warning("Valve %s start command sent but base station is offline - not marking as running", zone_id)
+        elif not valve_connected:
+            _LOGGER.warning("Valve %s start command sent but valve is not connected - not marking as running", zone_id)
+
+    async def _send_valve_command(self, url: str, payload: dict):
+        """Send a single valve command and return True once the API accepts it."""
+        async with self._get_session().put(url, headers=self.headers, json=payload) as resp:
+            _LOGGER.info("Valve command response status: %s", resp.status)
+            if resp.status >= 400:
+                _LOGGER.error("Valve command response text: %s", await resp.text())
+                resp.raise_for_status()
+            return True
 
     async def async_start_zone(self, zone_id, duration=600):
-        async with ClientSession() as session:
-            url = f"{CLOUD_BASE_URL}/{VALVE_START}"
-            payload = {"valveId": zone_id, "durationSeconds": duration}
-            method = session.put
-            _LOGGER.info("Starting valve: %s with payload: %s", url, payload)
-            async with method(url, headers=self.headers, json=payload) as resp:
-                _LOGGER.info("Start response status: %s", resp.status)
-                if resp.status >= 400:
-                    _LOGGER.error("Start response text: %s", await resp.text())
-                if resp.status in (200, 204):
-                    # Always mark as pending (for optimistic UI updates)
-                    # But only add to running_zones if both base station AND valve are connected
-                    self._pending_start[zone_id] = time.time() + 60
-                    valve_connected = self._is_valve_connected(zone_id)
-                    if self.base_station_connected and valve_connected:
-                        self.running_zones[zone_id] = {"id": zone_id, "remaining": duration}
-                        _LOGGER.debug(f"Valve {zone_id} start command sent - marked as running (base station and valve connected)")
-                    elif not self.base_station_connected:
-                        _LOGGER.warning(f"Valve {zone_id} start command sent but base station is offline - not marking as running")
-                    elif not valve_connected:
-                        _LOGGER.warning(f"Valve {zone_id} start command sent but valve is not connected - not marking as running")
-                    return True
-                resp.raise_for_status()
-                try:
-                    result = await resp.json()
-                    self._pending_start[zone_id] = time.time() + 60
-                    valve_connected = self._is_valve_connected(zone_id)
-                    if self.base_station_connected and valve_connected:
-                        self.running_zones[zone_id] = {"id": zone_id, "remaining": duration}
-                    return result
-                except Exception:
-                    return True
+        url = f"{CLOUD_BASE_URL}/{VALVE_START}"
+        payload = {"valveId": zone_id, "durationSeconds": duration}
+        _LOGGER.info("Starting valve: %s with payload: %s", url, payload)
+        result = await self._send_valve_command(url, payload)
+        self._mark_started(zone_id, duration)
+        self._push_state()
+        return result
 
     async def async_stop_zone(self, zone_id):
         # Immediately mark as force stopped to prevent race conditions
@@ -1174,12 +1347,13 @@ class RachioSmartHoseTimerHandler:
         # 2. Valve was only in pending_start (optimistic state) - RISKY, need more checks
         should_record = False
 
-        _LOGGER.debug(f"Valve {zone_id} stop check: in running_zones={zone_id in self.running_zones}, in pending_start={zone_id in self._pending_start}, running_zones={list(self.running_zones.keys())}, pending_start={self._pending_start}")
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Valve %s stop check: in running_zones=%s, in pending_start=%s, running_zones=%s, pending_start=%s", zone_id, zone_id in self.running_zones, zone_id in self._pending_start, list(self.running_zones.keys()), self._pending_start)
 
         if zone_id in self.running_zones:
             # Valve was confirmed running by API - safe to record
             should_record = True
-            _LOGGER.debug(f"Valve {zone_id} was confirmed running - will record completion time")
+            _LOGGER.debug("Valve %s was confirmed running - will record completion time", zone_id)
         elif zone_id in self._pending_start:
             # Valve was only optimistically started - need to verify
             # Only record if base station is currently connected, valve is connected, AND valve has recent activity
@@ -1190,127 +1364,94 @@ class RachioSmartHoseTimerHandler:
 
                 # Check if we're still within the pending window (60 seconds after start command)
                 # If so, trust that the valve actually started even if API hasn't caught up
-                import time as time_module
-                if zone_id in self._pending_start and self._pending_start[zone_id] > time_module.time():
+                pending_time_left = self._pending_start[zone_id] - time.monotonic()
+                if pending_time_left > 0:
                     # Still within 60-second window - assume valve actually started
                     valve_actually_started = True
-                    pending_time_left = self._pending_start[zone_id] - time_module.time()
-                    _LOGGER.debug(f"Valve {zone_id} stopped within pending window ({pending_time_left:.0f}s remaining) - assuming it started")
+                    _LOGGER.debug("Valve %s stopped within pending window (%.0fs remaining) - assuming it started", zone_id, pending_time_left)
                 else:
                     # Outside pending window - need API confirmation
-                    for valve in self.zones:
-                        if valve["id"] == zone_id:
-                            state = valve.get("state", {}).get("reportedState", {})
-                            last_action = state.get("lastWateringAction", {})
-                            if last_action.get("start"):
-                                try:
-                                    start_str = last_action["start"]
-                                    start_time = datetime.fromisoformat(start_str.replace("Z", "+00:00"))
-                                    # If the last action started within the last 2 minutes, the valve likely actually ran
-                                    time_since_start = (now - start_time).total_seconds()
-                                    if 0 <= time_since_start <= 120:
-                                        valve_actually_started = True
-                                        _LOGGER.debug(f"Valve {zone_id} has recent API activity ({time_since_start:.0f}s ago) - will record completion time")
-                                        break
-                                except (ValueError, KeyError):
-                                    pass
+                    valve = self._zones_by_id.get(zone_id)
+                    if valve is not None:
+                        state = valve.get("state", {}).get("reportedState", {})
+                        last_action = state.get("lastWateringAction", {})
+                        if last_action.get("start"):
+                            try:
+                                start_time = self._parsed_action_start(zone_id, last_action["start"])
+                                # If the last action started within the last 2 minutes, the valve likely actually ran
+                                time_since_start = (now - start_time).total_seconds()
+                                if 0 <= time_since_start <= 120:
+                                    valve_actually_started = True
+                                    _LOGGER.debug("Valve %s has recent API activity (%.0fs ago) - will record completion time", zone_id, time_since_start)
+                            except (ValueError, KeyError):
+                                pass
 
                 should_record = valve_actually_started
                 if not valve_actually_started:
-                    _LOGGER.debug(f"Valve {zone_id} was pending but no recent API activity - not recording completion time")
+                    _LOGGER.debug("Valve %s was pending but no recent API activity - not recording completion time", zone_id)
             elif not self.base_station_connected:
-                _LOGGER.debug(f"Valve {zone_id} was pending but base station is offline - not recording completion time")
+                _LOGGER.debug("Valve %s was pending but base station is offline - not recording completion time", zone_id)
             elif not valve_connected:
-                _LOGGER.debug(f"Valve {zone_id} was pending but valve is not connected - not recording completion time")
+                _LOGGER.debug("Valve %s was pending but valve is not connected - not recording completion time", zone_id)
             else:
-                _LOGGER.debug(f"Valve {zone_id} was pending but connection checks failed - not recording completion time")
+                _LOGGER.debug("Valve %s was pending but connection checks failed - not recording completion time", zone_id)
 
         if should_record:
             self._last_watering_completed[zone_id] = now
-            _LOGGER.debug(f"Valve {zone_id} stopped - recorded completion time")
+            _LOGGER.debug("Valve %s stopped - recorded completion time", zone_id)
 
         self.running_zones.pop(zone_id, None)
         self._pending_start.pop(zone_id, None)
-        _LOGGER.debug(f"Force stopped valve {zone_id} - cleared all local state")
+        _LOGGER.debug("Force stopped valve %s - cleared all local state", zone_id)
 
         # Now make the API call
-        async with ClientSession() as session:
-            url = f"{CLOUD_BASE_URL}/{VALVE_STOP}"
-            payload = {"valveId": zone_id}
-            _LOGGER.info("Stopping valve: %s with payload: %s", url, payload)
-            async with session.put(url, headers=self.headers, json=payload) as resp:
-                _LOGGER.info("Stop response status: %s", resp.status)
-                resp.raise_for_status()
-
-                # Try to parse response
-                if resp.status == 204:
-                    return True
-                try:
-                    return await resp.json()
-                except Exception:
-                    return True
+        url = f"{CLOUD_BASE_URL}/{VALVE_STOP}"
+        payload = {"valveId": zone_id}
+        _LOGGER.info("Stopping valve: %s with payload: %s", url, payload)
+        result = await self._send_valve_command(url, payload)
+        self._push_state()
+        return result
 
     async def async_start_schedule(self, schedule_id):
-        async with ClientSession() as session:
-            url = f"{CLOUD_BASE_URL}/{PROGRAM_GET.format(id=schedule_id)}"
-            payload = {"programId": schedule_id}
-            method = session.put
-            _LOGGER.info("Starting program: %s with payload: %s", url, payload)
-            async with method(url, headers=self.headers, json=payload) as resp:
-                _LOGGER.info("Start response status: %s", resp.status)
-                if resp.status in (200, 204):
-                    self._pending_start[schedule_id] = time.time() + 60
-                    if self.coordinator:
-                        await self.coordinator.async_request_refresh()
-                    return True
-                resp.raise_for_status()
-                try:
-                    result = await resp.json()
-                    self._pending_start[schedule_id] = time.time() + 60
-                    if self.coordinator:
-                        await self.coordinator.async_request_refresh()
-                    return result
-                except Exception:
-                    return True
+        session = self._get_session()
+        url = f"{CLOUD_BASE_URL}/{PROGRAM_GET.format(id=schedule_id)}"
+        payload = {"programId": schedule_id}
+        _LOGGER.info("Starting program: %s with payload: %s", url, payload)
+        async with session.put(url, headers=self.headers, json=payload) as resp:
+            _LOGGER.info("Start response status: %s", resp.status)
+            resp.raise_for_status()
+            self._mark_pending(schedule_id)
+            # Push optimistic state now; the calling entity requests the confirming poll
+            self._push_state()
+            return True
 
     async def async_stop_schedule(self, schedule_id):
         # Implement if needed
         pass
 
     def get_zone_default_duration(self, zone_id):
-        for zone in self.zones:
-            if zone.get("id") == zone_id:
-                return zone.get("duration") or zone.get("defaultRuntime") or 600
-        return 600
+        zone = self._zones_by_id.get(zone_id)
+        if zone is None:
+            return 600
+        return zone.get("duration") or zone.get("defaultRuntime") or 600
 
     def is_zone_optimistically_on(self, zone_id):
-        now = time.time()
-
-        # Check if we have a pending start that's still valid
-        has_pending_start = zone_id in self._pending_start and self._pending_start[zone_id] > now
-
-        # If we force stopped this valve, only consider it off if the stop was AFTER any pending start
-        if zone_id in self._force_stopped:
-            if has_pending_start:
-                # If there's a valid pending start that hasn't expired, the start happened more recently
-                pending_start_expiry = self._pending_start[zone_id]
-                if pending_start_expiry > now:  # pending start is still valid
-                    # This means start() was called after stop(), so the valve should be considered "on"
-                    return True
-            else:
-                # No valid pending start, and we have a force stop, so it's off
-                return False
-
-        return zone_id in self.running_zones or has_pending_start
+        pending = self._pending_start.get(zone_id, 0) > time.monotonic()
+        # A force stop wins unless a newer start is still within its pending window
+        if zone_id in self._force_stopped and not pending:
+            return False
+        return pending or zone_id in self.running_zones
 
     def _get_update_interval(self) -> timedelta:
         return get_update_interval(self)
 
     def _get_remaining_time(self) -> float:
         """Get remaining time in minutes."""
-        remaining_secs = 0
-        for zone in self.running_zones.values():
-            remaining_secs = max(remaining_secs, zone.get("remaining", 0))
-        for schedule in self.running_schedules.values():
-            remaining_secs = max(remaining_secs, schedule.get("remaining", 0))
+        remaining_secs = max(
+            (
+                running.get("remaining", 0)
+                for running in chain(self.running_zones.values(), self.running_schedules.values())
+            ),
+            default=0,
+        )
         return remaining_secs / 60  # Convert to minutes
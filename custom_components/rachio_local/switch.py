@@ -1,16 +1,16 @@
 """Support for Rachio switches."""
 from __future__ import annotations
 
-import asyncio
 import logging
 import time
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from typing import Any
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback, async_get_current_platform
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -21,9 +21,14 @@ from .const import (
     DEVICE_TYPE_CONTROLLER,
     DEVICE_TYPE_SMART_HOSE_TIMER,
 )
+from .utils import parse_iso_timestamp
 
 _LOGGER = logging.getLogger(__name__)
 
+# The same lastWateringAction start is reported on every poll until the valve
+# runs again, so memoize its parse (datetimes are immutable, safe to share)
+_parse_action_start = lru_cache(maxsize=256)(parse_iso_timestamp)
+
 RAIN_DELAY_OPTIONS = [
     (12, "12 hours"),
     (24, "24 hours"),
@@ -31,6 +36,22 @@ RAIN_DELAY_OPTIONS = [
     (72, "3 days"),
     (168, "1 week"),
 ]
+RAIN_DELAY_HOURS_TO_LABEL = dict(RAIN_DELAY_OPTIONS)
+RAIN_DELAY_LABEL_TO_HOURS = {label: hours for hours, label in RAIN_DELAY_OPTIONS}
+RAIN_DELAY_LABELS = list(RAIN_DELAY_HOURS_TO_LABEL.values())
+
+def _device_info(handler) -> dict:
+    """Build the device info shared by every entity of a handler.
+
+    Device identity never changes after setup, so entities store this once
+    instead of rebuilding the dict on each state write.
+    """
+    return {
+        "identifiers": {(DOMAIN, handler.device_id)},
+        "name": handler.name,
+        "model": handler.model,
+        "manufacturer": "Rachio",
+    }
 
 class RachioRainDelayDurationSelect(SelectEntity):
     def __init__(self, handler):
@@ -38,36 +59,27 @@ class RachioRainDelayDurationSelect(SelectEntity):
         self._attr_name = f"{handler.name} Rain Delay Duration"
         self._attr_unique_id = f"{handler.device_id}_rain_delay_duration"
         self._attr_entity_category = EntityCategory.CONFIG
-        self._attr_options = [label for _, label in RAIN_DELAY_OPTIONS]
+        self._attr_options = RAIN_DELAY_LABELS
         self._selected_hours = 24
         self._attr_current_option = self._get_label(self._selected_hours)
-
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self._handler.device_id)},
-            "name": self._handler.name,
-            "model": self._handler.model,
-            "manufacturer": "Rachio",
-        }
+        self._attr_device_info = _device_info(handler)
+        # Let the rain delay switch find this select without scanning the platform
+        handler.rain_delay_duration_select = self
 
     def _get_label(self, hours):
-        for h, label in RAIN_DELAY_OPTIONS:
-            if h == hours:
-                return label
-        return f"{hours} hours"
+        return RAIN_DELAY_HOURS_TO_LABEL.get(hours, f"{hours} hours")
 
     @property
     def current_option(self):
         return self._attr_current_option
 
     async def async_select_option(self, option: str):
-        for hours, label in RAIN_DELAY_OPTIONS:
-            if label == option:
-                self._selected_hours = hours
-                self._attr_current_option = label
-                self.async_write_ha_state()
-                return
+        hours = RAIN_DELAY_LABEL_TO_HOURS.get(option)
+        if hours is None:
+            return
+        self._selected_hours = hours
+        self._attr_current_option = option
+        self.async_write_ha_state()
 
     def get_selected_hours(self):
         return self._selected_hours
@@ -87,21 +99,25 @@ async def async_setup_entry(
 
         if handler.type == DEVICE_TYPE_CONTROLLER:
             entities.append(RachioStandbySwitch(coordinator, handler))
-            for zone in handler.zones:
-                if zone.get("enabled", True):
-                    entities.append(RachioZoneSwitch(coordinator, handler, zone))
-            for schedule in handler.schedules:
-                entities.append(RachioScheduleSwitch(coordinator, handler, schedule))
+            entities.extend(
+                RachioZoneSwitch(coordinator, handler, zone)
+                for zone in handler.zones
+                if zone.get("enabled", True)
+            )
+            entities.extend(RachioScheduleSwitch(coordinator, handler, schedule) for schedule in handler.schedules)
             # Always add rain delay duration select for controllers
             entities.append(RachioRainDelayDurationSelect(handler))
         elif handler.type == DEVICE_TYPE_SMART_HOSE_TIMER:
-            for valve in handler.zones:
-                entities.append(RachioValveSwitch(coordinator, handler, valve))
+            entities.extend(RachioValveSwitch(coordinator, handler, valve) for valve in handler.zones)
             # Note: Program switches removed - Smart Hose Timers run programs automatically
             # on their configured schedule. Program information is available as sensors instead.
     async_add_entities(entities)
 
-    # Register 'duration' as an optional parameter for turn_on, and register turn_off for custom stop
+    # Register 'duration' as an optional parameter for turn_on, and register turn_off for custom stop.
+    # Entity services resolve their targets across every entry's platform at call
+    # time, so they only need registering for the first config entry.
+    if hass.services.has_service(DOMAIN, "turn_on"):
+        return
     platform = async_get_current_platform()
     platform.async_register_entity_service(
         "turn_on",
@@ -122,16 +138,24 @@ class RachioSwitch(CoordinatorEntity, SwitchEntity):
         super().__init__(coordinator)
         self.handler = handler
         self._attr_has_entity_name = True
+        self._attr_device_info = _device_info(handler)
 
-    @property
-    def device_info(self):
-        """Return device info."""
-        return {
-            "identifiers": {(DOMAIN, self.handler.device_id)},
-            "name": self.handler.name,
-            "model": self.handler.model,
-            "manufacturer": "Rachio",
-        }
+    def _schedule_delayed_refresh(self, delay: int) -> None:
+        """Refresh the coordinator after a delay, sharing one pending refresh per coordinator.
+
+        A burst of start/stop presses schedules a single confirming poll instead of
+        one sleeping task (and API call) per press. Each press restarts the delay,
+        so the poll always lands a full delay after the last command.
+        """
+        coordinator = self.coordinator
+        if coordinator.delayed_refresh is not None:
+            coordinator.delayed_refresh.cancel()
+
+        def _refresh() -> None:
+            coordinator.delayed_refresh = None
+            self.hass.async_create_task(coordinator.async_request_refresh())
+
+        coordinator.delayed_refresh = self.hass.loop.call_later(delay, _refresh)
 
 class RachioZoneSwitch(RachioSwitch):
     """Representation of a zone switch."""
@@ -143,32 +167,37 @@ class RachioZoneSwitch(RachioSwitch):
         self.zone_name = zone.get("name", f"Zone {zone.get('zoneNumber', '')}")
         self._attr_name = f"Zone: {self.zone_name}"
         self._attr_unique_id = f"{handler.device_id}_{self.zone_id}_zone"
+        self._refresh_is_on()
+        self._refresh_attributes()
 
-    @property
-    def is_on(self):
-        # Use handler's shared optimistic state logic
-        state = self.handler.is_zone_optimistically_on(self.zone_id)
-        # Commented out to reduce log noise (property called frequently)
-        # _LOGGER.debug(f"[ZoneSwitch] is_on check: zone_id={self.zone_id}, is_on={state}, running_zones={list(self.handler.running_zones.keys())}, pending_start={getattr(self.handler, '_pending_start', {})}")
-        return state
+    def _refresh_is_on(self) -> None:
+        """Recompute the on state from the handler's shared optimistic state logic."""
+        self._attr_is_on = self.handler.is_zone_optimistically_on(self.zone_id)
 
-    @property
-    def extra_state_attributes(self):
-        """Return extra state attributes."""
-        return {
+    def _refresh_attributes(self) -> None:
+        """Rebuild the extra state attributes from the handler's current zone data."""
+        self._attr_extra_state_attributes = {
             "zone_id": self.zone_id,
             "default_duration": self.handler.get_zone_default_duration(self.zone_id)
         }
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update the cached on state and attributes when the coordinator pushes new data."""
+        self._refresh_is_on()
+        self._refresh_attributes()
+        super()._handle_coordinator_update()
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
         duration = kwargs.get("duration")
         if duration is None:
             duration = self.handler.get_zone_default_duration(self.zone_id)
         await self.handler.async_start_zone(self.zone_id, duration=duration)
+        self._refresh_is_on()
         self.async_write_ha_state()  # Update UI immediately
         # Schedule refresh after 5 seconds to allow API to catch up
-        asyncio.create_task(self._delayed_refresh(5))
+        self._schedule_delayed_refresh(5)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
@@ -178,14 +207,10 @@ class RachioZoneSwitch(RachioSwitch):
         # We need to clear optimistic state even if the zone isn't actually running
         await self.handler.async_stop_zone(self.zone_id)
         # async_stop_zone already clears running_zones and _pending_start
+        self._refresh_is_on()
         self.async_write_ha_state()  # Update UI immediately
         # Schedule refresh after 5 seconds to allow API to catch up
-        asyncio.create_task(self._delayed_refresh(5))
-
-    async def _delayed_refresh(self, delay: int) -> None:
-        """Refresh coordinator after a delay."""
-        await asyncio.sleep(delay)
-        await self.coordinator.async_request_refresh()
+        self._schedule_delayed_refresh(5)
 
 class RachioScheduleSwitch(RachioSwitch):
     """Representation of a schedule switch."""
@@ -199,11 +224,13 @@ class RachioScheduleSwitch(RachioSwitch):
         self._attr_unique_id = f"{handler.device_id}_{self.schedule_id}_schedule"
         # Remove entity category to move to Controls
         self._attr_entity_category = None
+        self._attr_is_on = self.schedule_id in handler.running_schedules
 
-    @property
-    def is_on(self):
-        """Return if the switch is on (true API state, not just optimistic)."""
-        return self.schedule_id in self.handler.running_schedules
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update the cached on state (true API state, not just optimistic)."""
+        self._attr_is_on = self.schedule_id in self.handler.running_schedules
+        super()._handle_coordinator_update()
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
@@ -219,21 +246,15 @@ class RachioScheduleSwitch(RachioSwitch):
 class RachioValveSwitch(RachioZoneSwitch):
     """Representation of a valve switch."""
 
-    @property
-    def is_on(self):
-        """Return if the valve is on (using optimistic state)."""
-        return self.handler.is_zone_optimistically_on(self.zone_id)
-
-    @property
-    def extra_state_attributes(self):
-        """Return extra state attributes including run history."""
+    def _refresh_attributes(self) -> None:
+        """Rebuild the extra state attributes, including run history."""
         attributes = {
             "valve_id": self.zone_id,
             "default_duration": self.handler.get_zone_default_duration(self.zone_id)
         }
 
         # Add run summary information if available
-        if hasattr(self.handler, 'valve_run_summaries') and self.zone_id in self.handler.valve_run_summaries:
+        if self.zone_id in self.handler.valve_run_summaries:
             summaries = self.handler.valve_run_summaries[self.zone_id]
 
             # Add previous run information
@@ -262,7 +283,7 @@ class RachioValveSwitch(RachioZoneSwitch):
                 if next_run.get("program_name"):
                     attributes["next_run_program"] = next_run["program_name"]
 
-        return attributes
+        self._attr_extra_state_attributes = attributes
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
@@ -270,9 +291,10 @@ class RachioValveSwitch(RachioZoneSwitch):
         if duration is None:
             duration = self.handler.get_zone_default_duration(self.zone_id)
         await self.handler.async_start_zone(self.zone_id, duration=duration)
+        self._refresh_is_on()
         self.async_write_ha_state()  # Update UI immediately
         # Schedule refresh after 5 seconds to allow API to catch up
-        asyncio.create_task(self._delayed_refresh(5))
+        self._schedule_delayed_refresh(5)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
@@ -282,9 +304,10 @@ class RachioValveSwitch(RachioZoneSwitch):
         # We need to clear optimistic state even if the valve isn't actually running
         await self.handler.async_stop_zone(self.zone_id)
         # async_stop_zone already clears running_zones and _pending_start
+        self._refresh_is_on()
         self.async_write_ha_state()  # Update UI immediately
         # Schedule refresh after 5 seconds to allow API to catch up
-        asyncio.create_task(self._delayed_refresh(5))
+        self._schedule_delayed_refresh(5)
 
 class RachioTimerProgramSwitch(RachioScheduleSwitch):
     """Representation of a valve program switch."""
@@ -293,7 +316,7 @@ class RachioTimerProgramSwitch(RachioScheduleSwitch):
         super().__init__(coordinator, handler, program)
         self.valve_ids = program.get("valveIds") or program.get("zoneIds") or []
 
-    def _is_valve_running(self, valve):
+    def _is_valve_running(self, valve, now):
         # Check if the valve is currently running based on lastWateringAction
         action = valve.get("state", {}).get("reportedState", {}).get("lastWateringAction", {})
         start_str = action.get("start")
@@ -301,25 +324,24 @@ class RachioTimerProgramSwitch(RachioScheduleSwitch):
         if not start_str or duration == 0:
             return False
         try:
-            start = datetime.fromisoformat(start_str.replace("Z", "+00:00"))
+            start = _parse_action_start(start_str)
         except Exception:
             return False
         end = start + timedelta(seconds=duration)
-        now = datetime.now(timezone.utc)
         return now < end
 
     @property
     def is_on(self):
         # Optimistic: always on for 60 seconds after start
-        now = time.time()
-        optimistic_window = 60
-        if hasattr(self.handler, '_pending_start') and self.schedule_id in self.handler._pending_start:
-            if self.handler._pending_start[self.schedule_id] > now:
-                return True  # Still in optimistic window
+        if self.handler._pending_start.get(self.schedule_id, 0) > time.monotonic():
+            return True  # Still in optimistic window
         # After 60s, use real valve status
-        if self.valve_ids and hasattr(self.handler, "zones"):
-            for valve in self.handler.zones:
-                if valve.get("id") in self.valve_ids and self._is_valve_running(valve):
+        if self.valve_ids:
+            zones_by_id = self.handler._zones_by_id
+            now = datetime.now(timezone.utc)
+            for valve_id in self.valve_ids:
+                valve = zones_by_id.get(valve_id)
+                if valve is not None and self._is_valve_running(valve, now):
                     return True
             return False
         # Fallback to optimistic logic if no valve IDs
@@ -367,12 +389,9 @@ class RachioRainDelaySwitch(RachioSwitch):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on (enable rain delay for selected duration)."""
-        # Find the select entity for this handler
-        duration_hours = 24
-        for entity in self.platform.entities:
-            if isinstance(entity, RachioRainDelayDurationSelect) and entity._handler == self.handler:
-                duration_hours = entity.get_selected_hours()
-                break
+        # Use the duration chosen on this handler's select entity
+        select = self.handler.rain_delay_duration_select
+        duration_hours = select.get_selected_hours() if select else 24
         await self.handler.async_set_rain_delay(duration_hours)
         await self.coordinator.async_request_refresh()
 
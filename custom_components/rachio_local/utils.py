@@ -1,81 +1,159 @@
-from datetime import timedelta, datetime, timezone
+from datetime import timedelta, datetime
 import email.utils
+import math
+import time
+from functools import lru_cache
+
+# Computed (non-configured) intervals are rounded up to this step, in seconds
+INTERVAL_QUANTUM = 5
+
+# Longest polling pause for rate limiting (exhausted quota or pacing), in seconds
+RATE_LIMIT_MAX_WAIT = 1800
+# Polling pause while the API rate limit is exhausted and no usable reset time is known
+RATE_LIMIT_PAUSE = timedelta(seconds=RATE_LIMIT_MAX_WAIT)
+
+
+# Python 3.11+ accepts a trailing "Z" natively (supported HA releases require 3.12+)
+parse_iso_timestamp = datetime.fromisoformat
+
+
+def update_in_place(target: dict, source: dict) -> None:
+    """Make target equal to source without replacing the dict object.
+
+    Skips all work in the steady state where nothing changed, and otherwise
+    only touches the keys that were added, removed or modified.
+    """
+    if target == source:
+        return
+    for key in target.keys() - source.keys():
+        del target[key]
+    for key, value in source.items():
+        if target.get(key) != value:
+            target[key] = value
+
+@lru_cache(maxsize=16)
+def _parse_http_date(value: str) -> float | None:
+    """Parse an RFC 1123 rate limit reset header to an epoch timestamp, or return None if it isn't one.
+
+    The same reset value is seen on every poll until the rate limit window resets,
+    so results (including failures) are memoized.
+    """
+    try:
+        reset_dt = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    # A "-0000" zone parses as a naive datetime, whose timestamp would be taken as local time
+    if reset_dt.tzinfo is None:
+        return None
+    return reset_dt.timestamp()
+
+def _seconds_until_reset(reset) -> float | None:
+    """Return the seconds left until a rate limit reset header, or None if unknown or already past."""
+    if not reset:
+        return None
+    # Try parsing as RFC 1123 (HTTP date)
+    reset_ts = _parse_http_date(reset)
+    if reset_ts is None:
+        return None
+    wait = reset_ts - time.time()
+    return wait if wait > 0 else None
+
+def _quantize(seconds: float) -> int:
+    """Round a computed interval up to the next INTERVAL_QUANTUM seconds.
+
+    Keeps the reset wait and quota pacing from shifting the coordinator's
+    refresh timer by a few seconds on every poll. Rounding up never polls
+    before the reset or faster than the pace.
+    """
+    return math.ceil(seconds / INTERVAL_QUANTUM) * INTERVAL_QUANTUM
+
+@lru_cache(maxsize=8)
+def _seconds_td(seconds: int) -> timedelta:
+    """Return a shared timedelta for a configured polling interval (in seconds)."""
+    return timedelta(seconds=seconds)
+
+def _min_remaining(entries) -> float | None:
+    """Return the smallest positive "remaining" across running entries, or None if none are active."""
+    return min(
+        (remaining for remaining in (entry.get("remaining", 0) for entry in entries) if remaining > 0),
+        default=None,
+    )
+
+def _watering_interval(remaining_secs: float, active_interval: int) -> timedelta:
+    """Return the polling interval while watering with remaining_secs left."""
+    # When actively watering, use the active polling interval
+    # For very short remaining times (< 2 minutes), poll more frequently
+    if remaining_secs < 120:
+        return _seconds_td(min(active_interval, 60))
+    else:
+        return _seconds_td(active_interval)
+
+def _idle_interval(idle_interval: int, pace: float | None) -> timedelta:
+    """Return the idle polling interval, stretched to the rate limit pace when that is longer."""
+    if pace is not None and pace > idle_interval:
+        return timedelta(seconds=_quantize(pace))
+    return _seconds_td(idle_interval)
 
 def get_update_interval(handler) -> timedelta:
-    """Smart polling: poll based on the currently running zone's remaining time, else schedule, else idle. Pause polling if API limit exceeded."""
+    """Smart polling: poll based on the currently running zone's remaining time, else schedule, else idle. Pause polling if API limit exceeded, and stretch idle polling to make the remaining quota last until reset."""
     # If API rate limit is exceeded, pause polling for 30 minutes (or until reset)
-    if hasattr(handler, 'api_rate_remaining') and handler.api_rate_remaining is not None:
+    pace = None
+    if handler.api_rate_remaining is not None:
         try:
-            if int(handler.api_rate_remaining) <= 0:
-                # If we know the reset time, calculate the wait
-                reset = handler.api_rate_reset
-                if reset:
-                    try:
-                        # Try parsing as RFC 1123 (HTTP date)
-                        reset_dt = email.utils.parsedate_to_datetime(reset)
-                        now = datetime.now(timezone.utc)
-                        wait = (reset_dt - now).total_seconds()
-                        if wait > 0:
-                            return timedelta(seconds=min(wait, 1800))  # Wait until reset, max 30 min
-                    except Exception:
-                        pass
-                return timedelta(minutes=30)
-        except Exception:
-            pass
-    active = False
-    zone_remaining = None
-    schedule_remaining = None
+            rate_remaining = int(handler.api_rate_remaining)
+        except (TypeError, ValueError):
+            # Unparseable header: ignore it rather than pausing polling
+            rate_remaining = None
+        if rate_remaining is not None:
+            # If we know the reset time, calculate the wait
+            wait = _seconds_until_reset(handler.api_rate_reset)
+            if rate_remaining <= 0:
+                if wait is not None:
+                    return timedelta(seconds=min(_quantize(wait), RATE_LIMIT_MAX_WAIT))  # Wait until reset, max 30 min
+                return RATE_LIMIT_PAUSE
+            if wait is not None:
+                # Spread the remaining requests over the rest of the window. Every
+                # device polls against the same API key's quota and each poll makes
+                # several requests; cap the pace so app-started runs are still noticed
+                num_devices = getattr(handler.coordinator, "num_devices", None) or 1
+                calls_per_poll = handler.API_CALLS_PER_POLL * num_devices
+                pace = min(wait * calls_per_poll / rate_remaining, RATE_LIMIT_MAX_WAIT)
+    # Configurable polling intervals (both handlers default these in __init__)
+    idle_interval = handler.idle_polling_interval
+    active_interval = handler.active_polling_interval
+
     # Check running zones and schedules
-    if hasattr(handler, 'running_zones') and hasattr(handler, 'running_schedules'):
-        running_zones = handler.running_zones.values() if isinstance(handler.running_zones, dict) else handler.running_zones
-        running_schedules = handler.running_schedules.values() if isinstance(handler.running_schedules, dict) else handler.running_schedules
-        # Find the zone with the minimum remaining time (should only be one active per controller)
-        for zone in running_zones:
-            if zone.get("remaining", 0) > 0:
-                active = True
-                if zone_remaining is None or zone["remaining"] < zone_remaining:
-                    zone_remaining = zone["remaining"]
-        # If no zone is running, check for schedule remaining
-        for schedule in running_schedules:
-            if schedule.get("remaining", 0) > 0:
-                active = True
-                if schedule_remaining is None or schedule["remaining"] < schedule_remaining:
-                    schedule_remaining = schedule["remaining"]
+    # Both handlers keep these as dicts keyed by zone/schedule id
+    running_zones = handler.running_zones
+    running_schedules = handler.running_schedules
+    # Nothing running or pending (the usual case): skip the scans entirely
+    if not running_zones and not running_schedules and not handler._pending_start:
+        return _idle_interval(idle_interval, pace)
+
+    # Find the zone with the minimum remaining time (should only be one active per controller)
+    zone_remaining = _min_remaining(running_zones.values())
 
     # Also check for pending starts (optimistic state)
-    if hasattr(handler, '_pending_start') and handler._pending_start:
-        import time as time_module
-        now = time_module.time()
+    if handler._pending_start:
+        # Pending starts expire on the monotonic clock so wall clock jumps can't extend or cut them short
+        now = time.monotonic()
         for zone_id, expires_at in handler._pending_start.items():
             if expires_at > now:
-                active = True
                 # Get the actual remaining time from running_zones if available
                 # (which contains the duration we sent when starting the zone)
-                if zone_id in handler.running_zones:
-                    pending_remaining = handler.running_zones[zone_id].get("remaining", 600)
+                running = running_zones.get(zone_id)
+                if running is not None:
+                    pending_remaining = running.get("remaining", 600)
                 else:
-                    # Fallback: try to get default duration from zone attributes
-                    if hasattr(handler, 'get_zone_default_duration'):
-                        pending_remaining = handler.get_zone_default_duration(zone_id)
-                    else:
-                        pending_remaining = 600  # Ultimate fallback: 10 minutes
+                    # Fallback: default duration from zone attributes (600s if unknown)
+                    pending_remaining = handler.get_zone_default_duration(zone_id)
 
                 if zone_remaining is None or pending_remaining < zone_remaining:
                     zone_remaining = pending_remaining
-    # Use zone remaining if available, else schedule, else idle
-    remaining_secs = zone_remaining if zone_remaining is not None else schedule_remaining
-
-    # Get configurable polling intervals (with defaults)
-    idle_interval = getattr(handler, 'idle_polling_interval', 300)
-    active_interval = getattr(handler, 'active_polling_interval', 120)
 
-    if not active or remaining_secs is None:
-        return timedelta(seconds=idle_interval)
-
-    # When actively watering, use the active polling interval
-    # For very short remaining times (< 2 minutes), poll more frequently
-    remaining_mins = remaining_secs / 60
-    if remaining_mins < 2:
-        return timedelta(seconds=min(active_interval, 60))
-    else:
-        return timedelta(seconds=active_interval)
+    # Use zone remaining if available, else schedule, else idle
+    # (schedules are only scanned when no zone is running)
+    remaining_secs = zone_remaining if zone_remaining is not None else _min_remaining(running_schedules.values())
+    if remaining_secs is None:
+        return _idle_interval(idle_interval, pace)
+    return _watering_interval(remaining_secs, active_interval)